@@ -2,6 +2,7 @@
 from flask import Flask
 from flask_migrate import Migrate
 from flask_cors import CORS
+from sqlalchemy import event
 from config import Config
 from .models import db
 
@@ -22,6 +23,15 @@ def create_app(config_class=Config):
    db.init_app(app)
    migrate.init_app(app, db)
 
+   # SQLite 는 WAL 모드로: 결과 일괄 저장 중에도 읽기가 막히지 않도록
+   with app.app_context():
+       if db.engine.dialect.name == 'sqlite':
+           event.listen(db.engine, 'connect', _enable_sqlite_wal)
+
+   # 순위 확인 결과 write-behind 기록기
+   from .keyword.writer import result_writer
+   result_writer.init_app(app)
+
    # 인증 블루프린트 등록
    from .auth.routes import auth_bp
    app.register_blueprint(auth_bp, url_prefix='/auth')
@@ -30,8 +40,19 @@ def create_app(config_class=Config):
    from .keyword.routes import keyword_bp
    app.register_blueprint(keyword_bp, url_prefix='/keyword')
 
+   # 스크래퍼 크롬 프로세스 감시 시작 (고아 프로세스 정리 + 메모리 측정)
+   from .keyword.supervisor import supervisor, BROWSER_REAP_INTERVAL
+   supervisor.start(BROWSER_REAP_INTERVAL)
+
    @app.route("/")
    def index():
        return "코드 변경 테스트 성공!"
 
-   return app
\ No newline at end of file
+   return app
+
+
+def _enable_sqlite_wal(dbapi_connection, connection_record):
+   cursor = dbapi_connection.cursor()
+   cursor.execute("PRAGMA journal_mode=WAL")
+   cursor.execute("PRAGMA synchronous=NORMAL")
+   cursor.close()
\ No newline at end of file
@@ -0,0 +1,119 @@
+# app/keyword/checker.py
+
+import os
+from datetime import datetime, timedelta, timezone
+from app.models import db, SearchQuery, Keyword
+from .scraper import run_check_many, TIMEOUT_STATUS, FAILED_STATUS
+from .writer import result_writer
+
+# 0 이면 페이지 지문이 같아도 지난 순위를 재사용하지 않고 매번 전체 추출 (부하 테스트/디버깅용)
+PAGE_REUSE = os.environ.get('PAGE_REUSE', '1') != '0'
+VOLATILITY_WEIGHT = 0.3  # 최근 확인에서 페이지가 바뀌었는지를 얼마나 크게 반영할지 (지수이동평균)
+
+
+def previous_results(keywords):
+    """연결된 키워드 모두가 같은 페이지 지문으로 확인된 정상 결과를 갖고 있으면 (지문, 결과 리스트), 아니면 None"""
+    fingerprints = {k.page_fingerprint for k in keywords}
+    if len(fingerprints) != 1 or None in fingerprints:
+        return None
+    if any(k.ranking is None or k.ranking_status in (FAILED_STATUS, TIMEOUT_STATUS) for k in keywords):
+        return None
+    return fingerprints.pop(), [(k.ranking_status, k.ranking, k.section) for k in keywords]
+
+
+def check_query(search_query, deep=False, deep_depth=None):
+    """검색어 하나를 한 번만 스크래핑하고, 그 결과를 연결된 모든 키워드에 나눠서 저장
+    deep=True 이면 통합검색에 없는 게시물을 탭 결과 페이지까지 확인
+    검색 결과 페이지 지문이 지난 확인과 같으면 섹션 추출 없이 지난 순위를 재사용
+    반환값: ({keyword_id: (상태, 순위, 섹션제목)}, 페이지 변경 여부 - 비교 대상이 없으면 None)
+    """
+    keywords = search_query.keywords.order_by(Keyword.id).all()
+    if not keywords:
+        return {}, None
+
+    keyword_ids = [k.id for k in keywords]
+    query_id = search_query.id
+    query_text = search_query.query_text
+    targets = [(k.post_url, k.post_title) for k in keywords]
+    previous = previous_results(keywords) if PAGE_REUSE else None
+    last_fingerprint = search_query.page_fingerprint
+    volatility = search_query.volatility
+    # 스크래핑 동안 DB 트랜잭션(SQLite 잠금)을 붙잡고 있지 않도록 먼저 끝냄
+    db.session.commit()
+
+    page_info = {}
+    results = run_check_many(query_text, targets, deep=deep, deep_depth=deep_depth,
+                             previous=previous, page_info=page_info)
+    fingerprint = page_info.get('fingerprint')
+
+    # 검색어 단위 변동성: 지난 확인과 지문이 달랐는지를 지수이동평균으로 누적 (재확인 주기 조절에 사용)
+    page_changed = page_info.get('changed')
+    query_row = {'id': query_id, 'last_checked_at': datetime.now(timezone.utc)}
+    if fingerprint:
+        query_row['page_fingerprint'] = fingerprint
+        if last_fingerprint:
+            changed = last_fingerprint != fingerprint
+            if page_changed is None:
+                page_changed = changed
+            query_row['volatility'] = (float(changed) if volatility is None
+                                       else (1 - VOLATILITY_WEIGHT) * volatility + VOLATILITY_WEIGHT * changed)
+
+    # 저장은 write-behind 기록기에 맡기고 바로 반환 (일정 개수/시간마다 일괄 저장)
+    now = query_row['last_checked_at']
+    result_writer.submit(
+        [{'id': keyword_id, 'ranking_status': status, 'ranking': rank, 'section': section, 'last_checked_at': now,
+          # 실패/시간 초과 결과는 다음 확인에서 재사용하면 안 되므로 지문을 남기지 않음
+          'page_fingerprint': None if status in (FAILED_STATUS, TIMEOUT_STATUS) else fingerprint}
+         for keyword_id, (status, rank, section) in zip(keyword_ids, results)],
+        [query_row],
+    )
+
+    print(f"'{query_text}' 결과를 키워드 {len(keyword_ids)}개에 반영 예약 (페이지 변경: {page_changed})")
+    return dict(zip(keyword_ids, results)), page_changed
+
+
+def recheck_interval(max_age, volatility):
+    """자주 바뀌는 검색어는 max_age 의 절반까지 당기고, 거의 안 바뀌는 검색어는 두 배까지 늦춤"""
+    if volatility is None:
+        return max_age
+    return max_age * (0.5 + 1.5 * (1 - volatility))
+
+
+def due_queries(max_age=timedelta(hours=6), limit=None):
+    """마지막 확인 후 확인 주기가 지난(또는 한 번도 확인하지 않은) 검색어 목록
+    확인 주기는 검색어의 변동성(volatility)에 따라 max_age 의 0.5~2배로 조절
+    """
+    now = datetime.now(timezone.utc)
+    # 가장 짧은 주기(max_age 의 절반)로 후보를 줄인 뒤 검색어별 주기로 다시 거름
+    cutoff = now - recheck_interval(max_age, 1.0)
+    candidates = (SearchQuery.query
+                  .filter(SearchQuery.keywords.any())
+                  .filter(db.or_(SearchQuery.last_checked_at.is_(None), SearchQuery.last_checked_at < cutoff))
+                  .order_by(SearchQuery.last_checked_at.asc().nullsfirst())
+                  .all())
+    queries = []
+    for search_query in candidates:
+        last_checked_at = search_query.last_checked_at
+        if last_checked_at is not None:
+            if last_checked_at.tzinfo is None:
+                # SQLite 는 시간대 정보 없이 저장하므로 UTC 로 간주
+                last_checked_at = last_checked_at.replace(tzinfo=timezone.utc)
+            if now - last_checked_at < recheck_interval(max_age, search_query.volatility):
+                continue
+        queries.append(search_query)
+        if limit and len(queries) >= limit:
+            break
+    return queries
+
+
+def check_due_queries(max_age=timedelta(hours=6), limit=None, deep=False, deep_depth=None):
+    """확인 시기가 된 검색어를 검색어 단위로 순서대로 확인"""
+    queries = due_queries(max_age, limit)
+    print(f"확인 대상 검색어 {len(queries)}개")
+    for search_query in queries:
+        try:
+            check_query(search_query, deep=deep, deep_depth=deep_depth)
+        except Exception as e:
+            db.session.rollback()
+            print(f"'{search_query.query_text}' 확인 중 오류: {e}")
+    return len(queries)
@@ -0,0 +1,135 @@
+# app/keyword/deep_rank.py
+
+import os
+import urllib.parse
+import requests
+from bs4 import BeautifulSoup
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from .scraper import is_valid_content_link, href_or_text_matches, DEEP_SECTION_SUFFIX, FAILED_STATUS
+
+# 통합검색 첫 페이지에 없을 때 블로그/카페/VIEW 탭의 여러 페이지를 훑어서 절대 순위를 구한다.
+# 탭 결과 페이지는 서버에서 렌더링되므로 브라우저 없이 requests + BeautifulSoup 로 동시에 가져온다.
+
+# (표시 이름, where 파라미터)
+DEEP_VERTICALS = [("블로그", "blog"), ("카페", "article"), ("VIEW", "view")]
+DEEP_PAGE_SIZE = 10  # start 파라미터 증가 폭 (실제 순위는 페이지에서 읽은 링크 수로 계산)
+DEEP_DEFAULT_DEPTH = int(os.environ.get('DEEP_RANK_DEPTH') or 3)
+DEEP_MAX_DEPTH = 10
+DEEP_WORKERS = 4
+FAILED_PAGE = object()  # 요청에 실패한 페이지 (결과가 없는 빈 페이지와 구분)
+
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36",
+    "Accept-Language": "ko-KR,ko;q=0.9",
+}
+
+LINK_SELECTORS = "a.title_link, a.api_txt_lines, a.total_tit, a.link_tit, a[class*='text-title']"
+
+
+def fetch_vertical_page(base_url, keyword, where, page, timeout=10):
+    """탭 결과 한 페이지를 가져와서 [(href, 텍스트), ...] 를 순서대로 반환"""
+    params = urllib.parse.urlencode({
+        "where": where,
+        "query": keyword,
+        "start": page * DEEP_PAGE_SIZE + 1,
+    })
+    res = requests.get(f"{base_url}/search.naver?{params}", headers=HEADERS, timeout=timeout)
+    res.raise_for_status()
+
+    soup = BeautifulSoup(res.text, "html.parser")
+    links = []
+    seen = set()
+    for a in soup.select(LINK_SELECTORS):
+        href = a.get("href") or ""
+        text = a.get_text(" ", strip=True)
+        if href in seen or not is_valid_content_link(href) or len(text) < 2:
+            continue
+        seen.add(href)
+        links.append((href, text))
+    return links
+
+
+def scan_vertical(base_url, keyword, name, where, targets, depth, deadline=None):
+    """한 탭의 1~depth 페이지를 동시에 가져와 대상별 절대 순위를 찾음
+    앞 페이지들이 모두 도착한 상태에서 발견되면(또는 시간 예산이 끝나면) 즉시 남은 요청을 취소한다.
+    중간 페이지 요청이 실패하면 그 뒤로는 절대 순위를 알 수 없으므로 거기서 멈춘다.
+    반환값: ({대상 인덱스: 절대 순위}, 끝까지 확인했는지 - 페이지 요청 실패로 멈췄으면 False)
+    """
+    found = {}
+    pages = [None] * depth
+    checked = 0     # 순서대로 검사를 마친 페이지 수
+    offset = 0      # 검사를 마친 페이지들의 링크 수 합계
+    seen = set()    # 페이지 사이 중복 링크 제거
+    complete = True
+
+    # with 문은 종료 시 실행 중인 요청까지 모두 기다리므로 직접 만들고 기다리지 않고 닫음
+    pool = ThreadPoolExecutor(max_workers=min(DEEP_WORKERS, depth))
+    try:
+        timeout = max(0.1, min(10, deadline.remaining())) if deadline else 10
+        futures = {pool.submit(fetch_vertical_page, base_url, keyword, where, page, timeout): page
+                   for page in range(depth)}
+        pending = set(futures)
+        while pending and len(found) < len(targets):
+            done, pending = wait(pending, timeout=deadline.remaining() if deadline else None,
+                                 return_when=FIRST_COMPLETED)
+            if not done:
+                print(f"  [{keyword}] {name} 탭 확인 중 시간 예산 초과")
+                break
+            for future in done:
+                page = futures[future]
+                try:
+                    pages[page] = future.result()
+                except Exception as e:
+                    print(f"  [{keyword}] {name} {page + 1}페이지 요청 실패: {e}")
+                    pages[page] = FAILED_PAGE
+
+            # 앞에서부터 도착한 페이지까지만 순서대로 검사 (절대 순위 계산을 위해)
+            while checked < depth and pages[checked] is not None:
+                if pages[checked] is FAILED_PAGE:
+                    complete = False
+                    checked = depth
+                    break
+                for href, text in pages[checked]:
+                    if href in seen:
+                        continue
+                    seen.add(href)
+                    offset += 1
+                    for i, (post_url, post_title) in enumerate(targets):
+                        if i not in found and href_or_text_matches(post_url, post_title, href, text):
+                            print(f"✅ [{keyword}] {name} 탭 {offset}위에서 발견! ({checked + 1}페이지)")
+                            found[i] = offset
+                checked += 1
+                # 한 페이지라도 비어 있으면 그 뒤로는 결과가 없다고 본다
+                if not pages[checked - 1]:
+                    checked = depth
+                    break
+            if checked >= depth:
+                break
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+    return found, complete or len(found) == len(targets)
+
+
+def deep_rank(base_url, keyword, targets, depth=DEEP_DEFAULT_DEPTH, deadline=None):
+    """블로그 -> 카페 -> VIEW 순으로 탭 결과를 훑어서 대상별 (상태, 순위, 섹션제목) 또는 None 반환
+    어느 탭에서도 못 찾았는데 요청 실패로 끝까지 보지 못한 탭이 있으면 "노출X" 대신 "확인 실패" 로 반환
+    """
+    depth = max(1, min(int(depth), DEEP_MAX_DEPTH))
+    results = [None] * len(targets)
+    incomplete = []  # 요청 실패로 끝까지 확인하지 못한 탭
+    for name, where in DEEP_VERTICALS:
+        remaining = [i for i, result in enumerate(results) if result is None]
+        if not remaining or (deadline and deadline.expired()):
+            break
+        print(f"[{keyword}] {name} 탭 {depth}페이지까지 심층 확인 중...")
+        found, complete = scan_vertical(base_url, keyword, name, where, [targets[i] for i in remaining], depth, deadline)
+        if not complete:
+            incomplete.append(f"{name}{DEEP_SECTION_SUFFIX}")
+        for j, rank in found.items():
+            section = f"{name}{DEEP_SECTION_SUFFIX}"
+            results[remaining[j]] = (section, rank, section)
+    if incomplete:
+        section = ", ".join(incomplete)
+        print(f"  [{keyword}] {section} 확인 중 요청 실패 - 찾지 못한 게시물은 확인 실패로 처리")
+        results = [result or (FAILED_STATUS, 999, section) for result in results]
+    return results
@@ -0,0 +1,119 @@
+# app/keyword/fake_search.py
+
+import os
+import glob
+import time
+import random
+import zlib
+import threading
+import urllib.parse
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+# 저장된 검색 페이지(debug_키워드.html)를 돌려주는 로컬 가짜 검색 서버.
+# 부하 테스트/오프라인 실행 시 SEARCH_BASE_URL 을 이 서버 주소로 바꿔서 사용한다.
+
+
+def load_recorded_pages(pages_dir):
+    """pages_dir 안의 debug_*.html 파일을 {키워드: html 바이트} 로 읽어옴"""
+    pages = {}
+    for path in sorted(glob.glob(os.path.join(pages_dir, "debug_*.html"))):
+        name = os.path.basename(path)[len("debug_"):-len(".html")]
+        with open(path, "rb") as f:
+            pages[name] = f.read()
+    return pages
+
+
+class FakeSearchServer:
+    """지연 시간과 오류율을 조절할 수 있는 가짜 검색 서버"""
+
+    def __init__(self, pages_dir=".", host="127.0.0.1", port=0,
+                 latency=(0.0, 0.0), error_rate=0.0):
+        self.pages = load_recorded_pages(pages_dir)
+        if not self.pages:
+            raise ValueError(f"{pages_dir} 에서 debug_*.html 파일을 찾지 못했습니다.")
+        self.latency = latency
+        self.error_rate = error_rate
+        self.request_count = 0
+        self.error_count = 0
+        self._lock = threading.Lock()
+        self._thread = None
+        self.httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self.httpd.daemon_threads = True
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def pick_page(self, query):
+        """쿼리와 같은 이름의 페이지가 없으면 저장된 페이지 중 하나를 고정적으로 선택"""
+        if query in self.pages:
+            return self.pages[query]
+        names = sorted(self.pages)
+        return self.pages[names[zlib.crc32(query.encode()) % len(names)]]
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                parsed = urllib.parse.urlparse(self.path)
+                query = urllib.parse.parse_qs(parsed.query).get("query", [""])[0]
+
+                low, high = server.latency
+                if high > 0:
+                    time.sleep(random.uniform(low, high))
+
+                with server._lock:
+                    server.request_count += 1
+                    fail = random.random() < server.error_rate
+                    if fail:
+                        server.error_count += 1
+
+                if fail:
+                    self.send_error(503, "fake search error")
+                    return
+
+                body = server.pick_page(query)
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # 요청마다 찍히는 로그는 생략
+
+        return Handler
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        print(f"가짜 검색 서버 시작: {self.base_url} (페이지 {len(self.pages)}개)")
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread:
+            self._thread.join()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="저장된 검색 페이지를 돌려주는 가짜 검색 서버")
+    parser.add_argument("--pages-dir", default=".")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", default="0,0", help="최소,최대 지연(초)")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    low, high = (float(x) for x in args.latency.split(","))
+    fake = FakeSearchServer(args.pages_dir, args.host, args.port, (low, high), args.error_rate)
+    print(f"가짜 검색 서버 시작: {fake.base_url} (페이지 {len(fake.pages)}개)")
+    try:
+        fake.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,45 @@
+# app/keyword/metrics.py
+
+import threading
+
+# 순위 확인 계측용 프로세스 내 카운터 (부하 테스트/모니터링에서 snapshot() 으로 읽음)
+
+_lock = threading.Lock()
+_counters = {}
+_durations = {}  # 결과 종류 -> [건수, 합계(초), 최대(초)]
+
+
+def increment(name, amount=1):
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + amount
+
+
+def record_check(outcome, seconds):
+    """확인 한 건의 결과 종류(found/not_found/unchanged/timeout/failed)와 소요 시간을 기록"""
+    with _lock:
+        _counters[f"checks_{outcome}"] = _counters.get(f"checks_{outcome}", 0) + 1
+        stats = _durations.setdefault(outcome, [0, 0.0, 0.0])
+        stats[0] += 1
+        stats[1] += seconds
+        stats[2] = max(stats[2], seconds)
+
+
+def snapshot():
+    with _lock:
+        return {
+            'counters': dict(_counters),
+            'durations': {
+                outcome: {
+                    'count': count,
+                    'avg_seconds': round(total / count, 3) if count else 0.0,
+                    'max_seconds': round(peak, 3),
+                }
+                for outcome, (count, total, peak) in _durations.items()
+            },
+        }
+
+
+def reset():
+    with _lock:
+        _counters.clear()
+        _durations.clear()
@@ -2,13 +2,18 @@
 
 # jsonify를 지우고, 우리가 만든 json_response를 가져옵니다.
 from flask import Blueprint, request
-from app.models import db, Keyword
+from app.models import db, Keyword, SearchQuery
 from app.auth.routes import token_required
-from .scraper import run_check
-from datetime import datetime
-from app.utils import json_response
-from datetime import datetime, timezone # timezone 추가
+from .checker import check_query, check_due_queries
+from .scraper import TIMEOUT_STATUS
+from .supervisor import supervisor
+from . import metrics
+from .writer import result_writer
+from .strategy import strategy_cache
+from app.utils import json_response, json_stream_response, STREAM_CHUNK_ROWS
 import traceback  # <-- 이 줄 추가
+from datetime import timedelta
+import click
 
 keyword_bp = Blueprint('keyword', __name__)
 
@@ -24,7 +29,8 @@ def create_keyword(current_user):
         keyword_text=data['keyword_text'],
         post_url=data['post_url'],
         post_title=data.get('post_title'),  # 이 줄이 있는지 확인!
-        priority=data.get('priority', '중')
+        priority=data.get('priority', '중'),
+        search_query=SearchQuery.get_or_create(data['keyword_text'])
     )
     db.session.add(new_keyword)
     db.session.commit()
@@ -34,22 +40,25 @@ def create_keyword(current_user):
 @keyword_bp.route('/keywords', methods=['GET'])
 @token_required
 def get_keywords(current_user):
-    keywords = Keyword.query.filter_by(user_id=current_user.id).order_by(Keyword.id.desc()).all()
-    output = []
-    for keyword in keywords:
-        keyword_data = {
-            'id': keyword.id,
-            'keyword_text': keyword.keyword_text,
-            'post_url': keyword.post_url,
-            'post_title': keyword.post_title,  # 이 줄이 있는지 확인!
-            'priority': keyword.priority,
-            'ranking_status': keyword.ranking_status,
-            'ranking': keyword.ranking,
-            'section': keyword.section,
-            'last_checked_at': keyword.last_checked_at.isoformat() if keyword.last_checked_at else None
-        }
-        output.append(keyword_data)
-    return json_response({'keywords': output})
+    keywords = (Keyword.query.filter_by(user_id=current_user.id)
+                .order_by(Keyword.id.desc())
+                .yield_per(STREAM_CHUNK_ROWS))
+    # 키워드가 많은 계정도 메모리에 전부 올리지 않도록 나눠서 스트리밍
+    return json_stream_response('keywords', (serialize_keyword(keyword) for keyword in keywords))
+
+
+def serialize_keyword(keyword):
+    return {
+        'id': keyword.id,
+        'keyword_text': keyword.keyword_text,
+        'post_url': keyword.post_url,
+        'post_title': keyword.post_title,  # 이 줄이 있는지 확인!
+        'priority': keyword.priority,
+        'ranking_status': keyword.ranking_status,
+        'ranking': keyword.ranking,
+        'section': keyword.section,
+        'last_checked_at': keyword.last_checked_at.isoformat() if keyword.last_checked_at else None
+    }
 
 
 @keyword_bp.route('/keywords/<int:keyword_id>/check', methods=['POST'])
@@ -58,29 +67,43 @@ def check_keyword_ranking(current_user, keyword_id):
     keyword = Keyword.query.filter_by(id=keyword_id, user_id=current_user.id).first()
     if not keyword:
         return json_response({'message': 'Keyword not found or permission denied'}, status=404)
+
+    # 심층 모드: ?deep=1&depth=5 또는 JSON {"deep": true, "depth": 5}
+    options = request.get_json(silent=True) or {}
+    deep = str(options.get('deep', request.args.get('deep', ''))).lower() in ('1', 'true', 'yes')
+    deep_depth = options.get('depth', request.args.get('depth'))
+    if deep_depth is not None:
+        # 잘못된 값이 심층 확인 안에서 조용히 "노출X" 로 바뀌지 않도록 여기서 거름
+        try:
+            if isinstance(deep_depth, (bool, float)):
+                raise ValueError
+            deep_depth = int(deep_depth)
+            if deep_depth < 1:
+                raise ValueError
+        except (TypeError, ValueError):
+            return json_response({'message': 'depth must be a positive integer'}, status=400)
     
     try:
         print(f"키워드 '{keyword.keyword_text}' 순위 확인 시작...")
-        
-        # 봇으로부터 (상태, 순위, 섹션제목) 세 값을 받음
-        status, rank, section = run_check(keyword.keyword_text, keyword.post_url, keyword.post_title)
+
+        # 예전 키워드는 공유 검색어가 없을 수 있으므로 여기서 연결
+        if keyword.search_query is None:
+            keyword.search_query = SearchQuery.get_or_create(keyword.keyword_text)
+
+        # 같은 검색어를 쓰는 모든 키워드를 한 번의 스크래핑으로 확인하고 DB에 반영
+        results, page_changed = check_query(keyword.search_query, deep=deep, deep_depth=deep_depth)
+        status, rank, section = results[keyword.id]
         
         print(f"스크래핑 결과 - 상태: {status}, 순위: {rank}, 섹션: {section}")
-        
-        # 세 값 모두 DB에 업데이트
-        keyword.ranking_status = status
-        keyword.ranking = rank
-        keyword.section = section
-        keyword.last_checked_at = datetime.now(timezone.utc) # UTC 시간임을 명시
-        
-        db.session.commit()
-        print("DB 업데이트 완료")
+        print("DB 반영 예약 완료")
         
         # 응답 메시지 구성
         if rank and rank > 0:
             response_message = f'순위 확인 완료. {section} 섹션에서 {rank}위에 노출되고 있습니다.'
         elif status == "노출X":
             response_message = f'순위 확인 완료. 현재 노출되지 않고 있습니다.'
+        elif status == TIMEOUT_STATUS:
+            response_message = f'시간 초과로 확인을 중단했습니다. 확인한 섹션: {section or "없음"}'
         else:
             response_message = f'순위 확인 완료. 상태: {status}'
 
@@ -88,7 +111,8 @@ def check_keyword_ranking(current_user, keyword_id):
             'message': response_message,
             'status': status,
             'ranking': rank,
-            'section': section
+            'section': section,
+            'page_changed': page_changed
         })
         
     except Exception as e:
@@ -109,11 +133,17 @@ def update_keyword(current_user, keyword_id):
     if not data:
         return json_response({'message': 'Request body is missing!'}, status=400)
 
+    # 검색어나 대상 게시물이 바뀌면 지난 결과를 재사용하면 안 되므로 페이지 지문을 지움
+    if any(field in data and data[field] != getattr(keyword, field)
+           for field in ('keyword_text', 'post_title', 'post_url')):
+        keyword.page_fingerprint = None
+
     # 수정 가능한 필드들 업데이트
     keyword.keyword_text = data.get('keyword_text', keyword.keyword_text)
     keyword.post_title = data.get('post_title', keyword.post_title)  # 이 줄 추가
     keyword.post_url = data.get('post_url', keyword.post_url)
     keyword.priority = data.get('priority', keyword.priority)
+    keyword.search_query = SearchQuery.get_or_create(keyword.keyword_text)
 
     db.session.commit()
 
@@ -138,4 +168,26 @@ def delete_keyword(current_user, keyword_id):
     db.session.delete(keyword)
     db.session.commit()
 
-    return json_response({'message': f'Keyword with ID {keyword_id} has been deleted.'})
\ No newline at end of file
+    return json_response({'message': f'Keyword with ID {keyword_id} has been deleted.'})
+
+
+@keyword_bp.route('/monitor', methods=['GET'])
+@token_required
+def monitor(current_user):
+    """모니터링용: 추적 중인 브라우저 수/메모리와 순위 확인 계측값"""
+    return json_response({
+        'browsers': supervisor.stats(),
+        'checks': metrics.snapshot(),
+        'pending_results': result_writer.pending,
+        'extraction_strategies': strategy_cache.stats(),
+    })
+
+
+@keyword_bp.cli.command('check-due')
+@click.option('--max-age-hours', default=6.0, help='마지막 확인 후 이 시간이 지난 검색어만 확인')
+@click.option('--limit', default=None, type=int, help='한 번에 확인할 최대 검색어 수')
+@click.option('--deep', is_flag=True, help='통합검색에 없으면 블로그/카페/VIEW 탭까지 확인')
+@click.option('--deep-depth', default=None, type=int, help='심층 모드에서 확인할 탭당 페이지 수')
+def check_due_command(max_age_hours, limit, deep, deep_depth):
+    """검색어 단위로 순위 확인 (flask keyword check-due)"""
+    check_due_queries(timedelta(hours=max_age_hours), limit, deep=deep, deep_depth=deep_depth)
\ No newline at end of file
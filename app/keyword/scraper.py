@@ -1,16 +1,56 @@
 # app/keyword/scraper.py
 
+import os
 import time
 import random
 import urllib.parse
 import re
 import traceback
+import threading
+import hashlib
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.service import Service
 from webdriver_manager.chrome import ChromeDriverManager
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from . import metrics
+from .supervisor import supervisor, kill_tree, driver_pid, PROCESS_MARKER
+from .strategy import strategy_cache, section_fingerprint
+
+# 검색 서버 주소 (부하 테스트 시 로컬 가짜 서버로 바꿔 끼움)
+SEARCH_BASE_URL = os.environ.get('SEARCH_BASE_URL') or 'https://search.naver.com'
+
+# 확인 한 건(페이지 이동 + 스크롤 + 추출)에 허용하는 총 시간
+CHECK_DEADLINE_SECONDS = float(os.environ.get('CHECK_DEADLINE_SECONDS') or 60)
+TIMEOUT_STATUS = "시간 초과"
+FAILED_STATUS = "확인 실패"
+DEEP_SECTION_SUFFIX = "탭"  # 심층 모드에서 탭 결과 페이지에서 찾은 결과의 섹션 이름 끝 ("블로그탭")
+
+class CheckTimeout(Exception):
+    """확인 시간 예산을 다 쓴 경우"""
+
+class Deadline:
+    """확인 한 건의 남은 시간 예산"""
+
+    def __init__(self, seconds):
+        self.seconds = seconds
+        self.expires_at = time.monotonic() + seconds
+
+    def remaining(self):
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self):
+        return self.remaining() <= 0
+
+    def check(self):
+        if self.expired():
+            raise CheckTimeout(f"{self.seconds:.0f}초 시간 예산 초과")
+
+    def sleep(self, seconds):
+        """남은 시간 안에서만 대기"""
+        time.sleep(min(seconds, self.remaining()))
+        self.check()
 
 # --- 보조 함수들 ---
 CAFE_HOSTS = {"cafe.naver.com", "m.cafe.naver.com"}
@@ -51,7 +91,10 @@ def url_or_title_matches(target_url, target_title, candidate_link):
     """URL 또는 제목으로 매칭"""
     href = candidate_link.get_attribute("href") or ""
     link_text = candidate_link.text.strip()
-    
+    return href_or_text_matches(target_url, target_title, href, link_text)
+
+def href_or_text_matches(target_url, target_title, href, link_text):
+    """이미 꺼내 둔 href/텍스트로 매칭 (같은 링크를 여러 게시물과 비교할 때 DOM 재조회 방지)"""
     # URL 매칭
     if url_matches(target_url, href):
         return True
@@ -65,9 +108,12 @@ def url_or_title_matches(target_url, target_title, candidate_link):
     
     return False
 
-def human_sleep(a=0.8, b=1.8):
-    """사람처럼 랜덤 대기"""
-    time.sleep(random.uniform(a, b))
+def human_sleep(a=0.8, b=1.8, deadline=None):
+    """사람처럼 랜덤 대기 (deadline 을 주면 시간 예산 안에서만)"""
+    if deadline:
+        deadline.sleep(random.uniform(a, b))
+    else:
+        time.sleep(random.uniform(a, b))
 
 def is_valid_content_link(href):
     """'일반 인기글' 로직을 위한 유효한 콘텐츠 링크인지 확인"""
@@ -93,10 +139,11 @@ def is_valid_content_link(href):
     return False
 
 # --- 메인 실행 함수 ---
-def run_check(keyword: str, post_url: str, post_title: str = None) -> tuple:
-    """키워드마다 다른 구조를 동적으로 파악하여 순위 측정"""
-    print(f"--- '{keyword}' 순위 확인 시작 ---")
-    
+# 0보다 크면 브라우저 하나를 여러 탭(격리된 컨텍스트)으로 나눠 쓰는 모드 (tabs.py)
+BROWSER_TABS = int(os.environ.get('BROWSER_TABS') or 0)
+
+def create_driver(kind="check"):
+    """순위 확인용 헤드리스 크롬 실행 (감시자에 등록됨, 종료는 quit_driver 로)"""
     options = webdriver.ChromeOptions()
     options.add_argument("--headless=new")
     options.add_argument("--window-size=1280,2200")
@@ -104,199 +151,468 @@ def run_check(keyword: str, post_url: str, post_title: str = None) -> tuple:
     options.add_argument("--no-sandbox")
     options.add_argument("--disable-blink-features=AutomationControlled")
     options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36")
+    options.add_argument(PROCESS_MARKER)  # 고아 프로세스 정리 시 우리 크롬인지 구분하는 표식
+    if kind == "pool":
+        # 기본(normal) 전략이면 chromedriver 가 로딩 중인 탭의 명령을 로딩이 끝날 때까지 붙잡아서
+        # TabPool 의 잠금을 쥔 채 탭 로딩이 하나씩 진행됨. 준비 여부는 TabPool 이 READY_SCRIPT 로 직접 확인
+        options.page_load_strategy = "none"
+    driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
+    supervisor.register(driver, kind)
+    return driver
+
+def quit_driver(driver):
+    """브라우저 종료 (응답이 없으면 프로세스를 강제 종료) 후 감시 대상에서 제거"""
+    try:
+        driver.quit()
+    except Exception:
+        kill_browser(driver)
+    supervisor.unregister(driver)
+
+def search_url(keyword):
+    return f"{SEARCH_BASE_URL}/search.naver?query={urllib.parse.quote(keyword)}"
+
+def run_check(keyword: str, post_url: str, post_title: str = None, deep: bool = False, deep_depth: int = None,
+              deadline_seconds: float = None) -> tuple:
+    """키워드마다 다른 구조를 동적으로 파악하여 순위 측정"""
+    return run_check_many(keyword, [(post_url, post_title)], deep=deep, deep_depth=deep_depth,
+                          deadline_seconds=deadline_seconds)[0]
+
+def run_check_many(keyword: str, targets: list, deep: bool = False, deep_depth: int = None,
+                   deadline_seconds: float = None, previous: tuple = None, page_info: dict = None) -> list:
+    """한 번의 검색으로 같은 검색어의 여러 게시물 순위를 측정
+    targets: [(post_url, post_title), ...] -> 같은 순서로 (상태, 순위, 섹션제목) 리스트 반환
+    deep=True 이면 통합검색에 없는 게시물을 블로그/카페/VIEW 탭 deep_depth 페이지까지 추가로 확인
+    시간 예산(deadline_seconds)을 넘기면 브라우저를 정리하고, 찾지 못한 대상은 "시간 초과" 상태와
+    그때까지 확인한 섹션 목록을 섹션 값으로 돌려준다.
+    previous=(지난 페이지 지문, 지난 결과 리스트) 를 주면 페이지 지문이 같을 때 추출/매칭 없이 지난 결과를 재사용하고,
+    page_info 로 넘긴 dict 에 {'fingerprint': 지문, 'changed': True/False/None(비교 대상 없음)} 를 채워 준다.
+    """
+    if BROWSER_TABS > 0:
+        from .tabs import shared_tab_pool  # tabs 가 이 모듈을 import 하므로 지연 import
+        return shared_tab_pool(BROWSER_TABS).check(keyword, targets, deep=deep, deep_depth=deep_depth,
+                                                   deadline_seconds=deadline_seconds,
+                                                   previous=previous, page_info=page_info)
+
+    print(f"--- '{keyword}' 순위 확인 시작 (대상 {len(targets)}개) ---")
     
+    deadline = Deadline(deadline_seconds or CHECK_DEADLINE_SECONDS)
+    started = time.monotonic()
+    outcome = "failed"
+    results = [None] * len(targets)
+    scanned_sections = []
     driver = None
+    watchdog = None
     try:
-        driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
-        q = urllib.parse.quote(keyword)
+        driver = create_driver()
+        deadline.check()
+        # 페이지 로드/스크립트가 예산을 넘지 않도록 하고, 그래도 멈춰 있으면 감시 타이머가 브라우저를 종료
+        driver.set_page_load_timeout(max(1, deadline.remaining()))
+        driver.set_script_timeout(max(1, deadline.remaining()))
+        watchdog = threading.Timer(deadline.remaining() + 5, kill_browser, args=(driver,))
+        watchdog.daemon = True
+        watchdog.start()
         
         print(f"[{keyword}] 통합검색 페이지 접근 중...")
-        driver.get(f"https://search.naver.com/search.naver?query={q}")
-        WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.ID, "main_pack")))
-        human_sleep()
+        driver.get(search_url(keyword))
+        WebDriverWait(driver, max(0.1, min(10, deadline.remaining()))).until(EC.presence_of_element_located((By.ID, "main_pack")))
+        human_sleep(deadline=deadline)
         
         driver.execute_script("window.scrollTo(0, document.body.scrollHeight)")
-        time.sleep(1.5)
+        deadline.sleep(1.5)
 
-        all_sections = driver.find_elements(By.CSS_SELECTOR, ".sc_new, .view_wrap")
-        print(f"[{keyword}] {len(all_sections)}개 섹션 발견")
-        
-        for section in all_sections:
-            try:
-                if not section.is_displayed() or section.size['height'] < 50:
-                    continue
-                
-                section_title = extract_section_title(section, keyword)
-                if "쇼핑" in section_title or "광고" in section_title:
-                    continue
+        # 페이지 구조가 지난번과 같으면 섹션 추출/매칭을 건너뜀
+        reused = reuse_if_unchanged(keyword, page_fingerprint(driver), previous, deep, page_info)
+        if reused is None:
+            scan_sections(driver, keyword, targets, results, deadline, scanned_sections)
+        else:
+            results[:] = reused
+            if all(results):
+                outcome = "unchanged"
+                return results
 
-                print(f"[{keyword}] 섹션: '{section_title}' 확인 중...")
-                
-                content_links = extract_content_links(section)
-                if not content_links:
-                    print(f"[{keyword}] '{section_title}'에서 콘텐츠 링크를 찾지 못함")
-                    continue
-                
-                print(f"[{keyword}] '{section_title}'에서 {len(content_links)}개 콘텐츠 링크 발견")
-                
-                # 중복 제거
-                unique_links = []
-                seen_hrefs = set()
-                for link in content_links:
-                    href = link.get_attribute('href')
-                    if href not in seen_hrefs:
-                        seen_hrefs.add(href)
-                        unique_links.append(link)
-
-                # 이 섹션 내에서만 순위 카운트
-                for rank, link in enumerate(unique_links, 1):
-                    if url_or_title_matches(post_url, post_title, link):
-                        print(f"✅ [{keyword}] '{section_title}' 섹션 내 {rank}위에서 발견!")
-                        return (section_title, rank, section_title)  # 섹션 내 순위만 반환
-            
-            except Exception:
-                continue
-        
-        print(f"❌ [{keyword}] 통합검색 결과에서 URL을 찾지 못함")
-        return ("노출X", 999, None)
+        def release_browser():
+            # 탭 페이지는 브라우저 없이 가져오므로 먼저 브라우저를 반납
+            nonlocal driver
+            watchdog.cancel()
+            quit_driver(driver)
+            driver = None
+
+        results = complete_results(keyword, targets, results, deep, deep_depth, deadline, release_browser)
+        outcome = "found" if any(result[1] != 999 for result in results) else "not_found"
+        return results
 
     except Exception as e:
+        # 감시 타이머가 브라우저를 끊은 경우도 여기로 오므로 남은 시간으로 판단
+        if isinstance(e, CheckTimeout) or deadline.expired():
+            outcome = "timeout"
+            return timeout_results(keyword, results, scanned_sections)
         print(f"🚨 [{keyword}] 순위 확인 중 심각한 오류 발생: {str(e)}")
         traceback.print_exc()
-        return ("확인 실패", 999, None)
+        return [(FAILED_STATUS, 999, None)] * len(targets)
     finally:
+        if watchdog:
+            watchdog.cancel()
         if driver:
-            driver.quit()
+            quit_driver(driver)
+        metrics.record_check(outcome, time.monotonic() - started)
         print(f"--- '{keyword}' 순위 확인 완료 ---\n")
 
-def extract_section_title(section, keyword):
-    """(개선) XPath와 텍스트 분석을 통해 더욱 정교하게 섹션 제목 추출"""
+# 섹션 순서와 각 섹션의 콘텐츠 링크 목록을 한 번에 모으는 스크립트
+# (카페 링크의 art 파라미터는 요청마다 바뀌는 서명 값이라 지문에서 제외)
+PAGE_FINGERPRINT_SCRIPT = """
+const content = /(blog|cafe|post|kin|tv|news)\\.naver\\.com|smartplace\\.naver/;
+const parts = [];
+document.querySelectorAll('.sc_new, .view_wrap').forEach(s => {
+    if (s.offsetHeight < 50) return;
+    const links = [];
+    s.querySelectorAll('a[href]').forEach(a => {
+        if (!content.test(a.href)) return;
+        let href = a.href;
+        try {
+            const u = new URL(a.href);
+            u.searchParams.delete('art');
+            href = u.origin + u.pathname + u.search;
+        } catch (e) {}
+        if (links[links.length - 1] !== href) links.push(href);
+    });
+    const cls = typeof s.className === 'string' ? s.className.replace(/\\d+/g, '') : '';
+    parts.push(cls + ':' + links.join(','));
+});
+return parts.join('\\n');
+"""
+
+def page_fingerprint(driver):
+    """현재 검색 결과 페이지의 섹션/링크 구조를 짧은 지문으로 (실패 시 None)"""
+    try:
+        structure = driver.execute_script(PAGE_FINGERPRINT_SCRIPT)
+    except Exception:
+        return None
+    return hashlib.sha1((structure or "").encode("utf-8")).hexdigest()[:16]
+
+def reuse_if_unchanged(keyword, fingerprint, previous, deep, page_info=None):
+    """지문이 지난번과 같으면 통합검색 페이지에서 나온 지난 결과를 재사용
+    지문은 통합검색 페이지만 본 것이므로 탭 결과 페이지에서 찾은 순위는 재사용하지 않고 None 으로 비워 둠
+    (비워 둔 대상은 통합검색에 없다는 것이 확인된 셈이므로 complete_results 로 바로 넘기면 됨)
+    반환값: 지난 결과 리스트(일부 None) 또는 재사용할 수 없으면 None
+    """
+    changed = None
+    if previous and previous[0] and fingerprint:
+        changed = previous[0] != fingerprint
+    if page_info is not None:
+        page_info.update(fingerprint=fingerprint, changed=changed)
+    if changed is not False:
+        return None
+
+    def reusable(result):
+        status, rank, section = result
+        if section and section.endswith(DEEP_SECTION_SUFFIX):
+            return False
+        # 심층 모드에서는 통합검색에 없던 게시물을 탭 페이지에서 다시 찾아봐야 함
+        return not (deep and rank == 999)
+
+    results = [result if reusable(result) else None for result in previous[1]]
+    print(f"♻️ [{keyword}] 페이지 구조가 지난 확인과 같아 통합검색 순위 {len(results) - results.count(None)}개를 재사용")
+    return results
+
+def scan_sections(driver, keyword, targets, results, deadline, scanned_sections):
+    """현재 열린 통합검색 페이지의 섹션을 위에서부터 훑으며 results 를 채움 (모두 찾으면 중단)"""
+    all_sections = driver.find_elements(By.CSS_SELECTOR, ".sc_new, .view_wrap")
+    print(f"[{keyword}] {len(all_sections)}개 섹션 발견")
+    
+    for section in all_sections:
+        deadline.check()
+        try:
+            if not section.is_displayed() or section.size['height'] < 50:
+                continue
+            
+            # 레이아웃 지문으로 지난번에 통한 제목 규칙/링크 추출 전략부터 사용
+            fingerprint = section_fingerprint(section)
+            section_title = extract_section_title(section, keyword, fingerprint)
+            if "쇼핑" in section_title or "광고" in section_title:
+                continue
+
+            print(f"[{keyword}] 섹션: '{section_title}' 확인 중...")
+            scanned_sections.append(section_title)
+            
+            content_links = extract_content_links(section, fingerprint)
+            if not content_links:
+                print(f"[{keyword}] '{section_title}'에서 콘텐츠 링크를 찾지 못함")
+                continue
+            
+            print(f"[{keyword}] '{section_title}'에서 {len(content_links)}개 콘텐츠 링크 발견")
+            
+            # 중복 제거 (href/텍스트는 한 번만 읽어 둠)
+            unique_links = []
+            seen_hrefs = set()
+            for link in content_links:
+                href = link.get_attribute('href')
+                if href not in seen_hrefs:
+                    seen_hrefs.add(href)
+                    unique_links.append((href or "", link.text.strip()))
+
+            # 이 섹션 내에서만 순위 카운트
+            for rank, (href, link_text) in enumerate(unique_links, 1):
+                for i, (post_url, post_title) in enumerate(targets):
+                    if results[i] is None and href_or_text_matches(post_url, post_title, href, link_text):
+                        print(f"✅ [{keyword}] '{section_title}' 섹션 내 {rank}위에서 발견!")
+                        results[i] = (section_title, rank, section_title)  # 섹션 내 순위만 반환
+
+            if all(results):
+                return results
+        
+        except Exception:
+            deadline.check()
+            continue
+    return results
+
+def complete_results(keyword, targets, results, deep, deep_depth, deadline, release_browser=None):
+    """통합검색에서 못 찾은 대상을 (심층 모드면 탭 페이지까지 본 뒤) "노출X" 로 채움
+    심층 확인 결과는 results 에 그대로 채워 넣으므로, 시간 초과로 끝나도 호출한 쪽의 timeout_results 가 볼 수 있음
+    """
+    if not all(results):
+        print(f"❌ [{keyword}] 통합검색 결과에서 찾지 못한 게시물 {results.count(None)}개")
+
+        if deep:
+            if release_browser:
+                release_browser()
+            results[:] = deep_check(keyword, targets, results, deep_depth, deadline)
+            if not all(results):
+                deadline.check()  # 예산이 끝나서 못 찾은 것이면 "시간 초과"로 처리
+
+    return [result or ("노출X", 999, None) for result in results]
+
+def timeout_results(keyword, results, scanned_sections):
+    """시간 초과 시 찾은 대상은 그대로, 나머지는 확인한 섹션 목록과 함께 "시간 초과" 로 반환"""
+    partial = ", ".join(scanned_sections)[:100] or None
+    print(f"⏱ [{keyword}] 시간 예산 초과 - 확인한 섹션 {len(scanned_sections)}개까지의 부분 결과 반환")
+    return [result or (TIMEOUT_STATUS, 999, partial) for result in results]
+
+def kill_browser(driver):
+    """응답이 없는 chromedriver 와 그 아래 chrome 프로세스를 강제로 종료"""
+    pid = driver_pid(driver)
+    if pid:
+        kill_tree(pid)
+
+def deep_check(keyword, targets, results, deep_depth=None, deadline=None):
+    """통합검색에서 못 찾은 대상만 탭 결과 페이지에서 심층 확인"""
+    from .deep_rank import deep_rank, DEEP_DEFAULT_DEPTH  # deep_rank 가 이 모듈을 import 하므로 지연 import
+
+    remaining = [i for i, result in enumerate(results) if result is None]
+    try:
+        deep_results = deep_rank(SEARCH_BASE_URL, keyword, [targets[i] for i in remaining],
+                                 deep_depth or DEEP_DEFAULT_DEPTH, deadline)
+    except Exception as e:
+        print(f"🚨 [{keyword}] 심층 순위 확인 중 오류 발생: {str(e)}")
+        return results
+
+    results = list(results)
+    for i, result in zip(remaining, deep_results):
+        results[i] = result
+    return results
+
+# --- 섹션 제목 규칙 (위에서부터 순서대로 시도) ---
+DEFAULT_SECTION_TITLE = "검색결과"  # 최후의 보루
+
+def title_from_headline(section, keyword):
+    """1. (기존 로직) 스마트블록/신규 섹션의 명시적 헤드라인 우선 탐색"""
+    # 섹션 내부에 h2, h3, a 태그 중에 title 클래스를 가진게 있는지 확인
     try:
-        # 1. (기존 로직) 스마트블록/신규 섹션의 명시적 헤드라인 우선 탐색
-        # 섹션 내부에 h2, h3, a 태그 중에 title 클래스를 가진게 있는지 확인
         title_element = section.find_element(By.CSS_SELECTOR, "h2.title, h3.title, a.title, [class*='headline']")
-        if title_element and title_element.text and len(title_element.text.strip()) > 1:
-            title_text = title_element.text.strip()
-            # "더보기" 같은 불필요한 텍스트 제거
-            if "더보기" in title_text:
-                title_text = title_text.split("더보기")[0].strip()
-            return title_text
-
-        # 2. (✨신규 로직✨) XPath를 사용해 섹션 바로 '이전' 요소에서 제목 탐색
-        # "건강·의학 인기글" 같은 제목은 섹션 밖에 위치하는 경우가 많습니다.
+    except Exception:
+        # 헤드라인 요소가 아예 없으면 기존 동작 그대로 기본 제목
+        return DEFAULT_SECTION_TITLE
+    if title_element and title_element.text and len(title_element.text.strip()) > 1:
+        title_text = title_element.text.strip()
+        # "더보기" 같은 불필요한 텍스트 제거
+        if "더보기" in title_text:
+            title_text = title_text.split("더보기")[0].strip()
+        return title_text
+    return None
+
+def title_from_prev_sibling(section, keyword):
+    """2. (✨신규 로직✨) XPath를 사용해 섹션 바로 '이전' 요소에서 제목 탐색"""
+    # "건강·의학 인기글" 같은 제목은 섹션 밖에 위치하는 경우가 많습니다.
+    try:
+        # 바로 직전의 형제 요소(div, h2 등)를 찾습니다.
+        prev_sibling = section.find_element(By.XPATH, "./preceding-sibling::*[1]")
+        prev_text = prev_sibling.text.strip()
+        if "인기글" in prev_text and len(prev_text) < 50:
+             return prev_text
+    except Exception:
+        pass # 이전 요소가 없으면 그냥 넘어갑니다.
+    return None
+
+def title_from_text_pattern(section, keyword):
+    """3. (기존 로직 개선) 섹션 내부 텍스트에서 '인기글' 패턴 찾기"""
+    section_text = section.text[:200]
+    if "인기글" in section_text:
+        match = re.search(r'([\w·\s]+)?인기글', section_text)
+        if match:
+            title = match.group(0).strip()
+            if len(title) < 30: return title
+        return "인기글"
+    return None
+
+def title_from_class_name(section, keyword):
+    """4. (기존 로직) 클래스명 기반으로 섹션 종류 추론"""
+    class_name = section.get_attribute("class") or ""
+    if "ad" in class_name or "power_link" in class_name: return "광고"
+    if "blog" in class_name: return "블로그"
+    if "cafe" in class_name: return "카페"
+    return None
+
+TITLE_RULES = [
+    ("headline", title_from_headline),
+    ("prev_sibling", title_from_prev_sibling),
+    ("text_pattern", title_from_text_pattern),
+    ("class_name", title_from_class_name),
+]
+
+def extract_section_title(section, keyword, fingerprint=None):
+    """(개선) XPath와 텍스트 분석을 통해 더욱 정교하게 섹션 제목 추출
+    fingerprint 가 있으면 같은 레이아웃에서 지난번에 통한 규칙부터 시도
+    """
+    learned = strategy_cache.get(fingerprint, "title")
+    rules = dict(TITLE_RULES)
+    if learned in rules:
         try:
-            # 바로 직전의 형제 요소(div, h2 등)를 찾습니다.
-            prev_sibling = section.find_element(By.XPATH, "./preceding-sibling::*[1]")
-            prev_text = prev_sibling.text.strip()
-            if "인기글" in prev_text and len(prev_text) < 50:
-                 return prev_text
+            title = rules[learned](section, keyword)
         except Exception:
-            pass # 이전 요소가 없으면 그냥 넘어갑니다.
-
-        # 3. (기존 로직 개선) 섹션 내부 텍스트에서 '인기글' 패턴 찾기
-        section_text = section.text[:200]
-        if "인기글" in section_text:
-            match = re.search(r'([\w·\s]+)?인기글', section_text)
-            if match:
-                title = match.group(0).strip()
-                if len(title) < 30: return title
-            return "인기글"
-
-        # 4. (기존 로직) 클래스명 기반으로 섹션 종류 추론
-        class_name = section.get_attribute("class") or ""
-        if "ad" in class_name or "power_link" in class_name: return "광고"
-        if "blog" in class_name: return "블로그"
-        if "cafe" in class_name: return "카페"
+            title = None
+        if title:
+            strategy_cache.record(fingerprint, "title", learned, hit=True)
+            return title
 
+    try:
+        for name, rule in TITLE_RULES:
+            if name == learned:
+                continue
+            title = rule(section, keyword)
+            if title:
+                strategy_cache.record(fingerprint, "title", name, hit=False)
+                return title
     except Exception:
         pass
-    return "검색결과" # 최후의 보루
+    return DEFAULT_SECTION_TITLE
+
 
+# --- 링크 추출 전략 (위에서부터 순서대로 시도) ---
+def links_from_text_containers(section):
+    """0. 스마트블록 우선 확인 (추가)"""
+    content_links = []
+    post_text_containers = section.find_elements(By.CSS_SELECTOR, "div[class*='text-container']")
+    for container in post_text_containers:
+        try:
+            title_link = container.find_element(By.CSS_SELECTOR, "a[class*='text-title']")
+            content_links.append(title_link)
+        except:
+            continue
+    return content_links
 
-def extract_content_links(section):
-    """실제 보이는 게시물 링크만 정확히 추출"""
+def links_from_anchor_scan(section):
+    """1. 일반 인기글 처리 (원본 그대로) - 리스트 아이템이 없으면 모든 링크 시도"""
     content_links = []
+    # 디버깅: 섹션 텍스트 확인
+    section_text = section.text[:200] if section.text else ""
+    if "인기글" in section_text:
+        print(f"  [디버깅] 인기글 섹션 발견, 텍스트: {section_text[:100]}...")
     
-    try:
-        # 0. 스마트블록 우선 확인 (추가)
-        post_text_containers = section.find_elements(By.CSS_SELECTOR, "div[class*='text-container']")
-        if post_text_containers:
-            for container in post_text_containers:
-                try:
-                    title_link = container.find_element(By.CSS_SELECTOR, "a[class*='text-title']")
-                    content_links.append(title_link)
-                except:
-                    continue
-            # 실제로 링크를 찾았을 때만 return
-            if content_links:
-                return content_links
-        
-        # 1. 일반 인기글 처리 (원본 그대로)
-        # 디버깅: 섹션 텍스트 확인
-        section_text = section.text[:200] if section.text else ""
-        if "인기글" in section_text:
-            print(f"  [디버깅] 인기글 섹션 발견, 텍스트: {section_text[:100]}...")
-        
-        # 리스트 아이템 방식
-        list_items = section.find_elements(By.CSS_SELECTOR, "li")
-        
-        # 리스트 아이템이 없으면 모든 링크 시도
-        if not list_items:
-            print(f"  [디버깅] li 요소 없음, 모든 a 태그 검색")
-            all_links = section.find_elements(By.TAG_NAME, "a")
-            for link in all_links:
-                href = link.get_attribute("href") or ""
-                text = link.text.strip()
-                if ("blog.naver" in href or "cafe.naver" in href) and len(text) > 5:
-                    print(f"    -> 링크 발견: {text[:30]}...")
-                    content_links.append(link)
+    # 리스트 아이템 방식
+    list_items = section.find_elements(By.CSS_SELECTOR, "li")
+    
+    if not list_items:
+        print(f"  [디버깅] li 요소 없음, 모든 a 태그 검색")
+        all_links = section.find_elements(By.TAG_NAME, "a")
+        for link in all_links:
+            href = link.get_attribute("href") or ""
+            text = link.text.strip()
+            if ("blog.naver" in href or "cafe.naver" in href) and len(text) > 5:
+                print(f"    -> 링크 발견: {text[:30]}...")
+                content_links.append(link)
+    return content_links
 
-        # 2. 리스트 구조가 아닌 경우
-        if not content_links:
-            link_selectors = [
-                "a.title_link",
-                "a.api_txt_lines",
-                "a.link_tit",
-                "a.total_tit",
-                "a.name",
-                "a.dsc_link",
-                "a[href*='blog.naver']",
-                "a[href*='cafe.naver']",
-            ]
-            
-            for selector in link_selectors:
-                links = section.find_elements(By.CSS_SELECTOR, selector)
-                for link in links:
-                    if link.is_displayed() and link not in content_links:
-                        href = link.get_attribute("href") or ""
-                        text = link.text.strip()
-                        
-                        if is_valid_content_link(href) and len(text) > 5:
-                            content_links.append(link)
-        
-        # 3. 그래도 없으면 모든 링크 확인 (최후 수단)
-        if not content_links:
-            all_links = section.find_elements(By.TAG_NAME, 'a')
-            
-            for link in all_links:
-                if not link.is_displayed():
-                    continue
-                
-                # 너무 작은 링크 제외
-                if link.size['height'] < 10 or link.size['width'] < 10:
-                    continue
-                
+def links_from_selectors(section):
+    """2. 리스트 구조가 아닌 경우"""
+    content_links = []
+    link_selectors = [
+        "a.title_link",
+        "a.api_txt_lines",
+        "a.link_tit",
+        "a.total_tit",
+        "a.name",
+        "a.dsc_link",
+        "a[href*='blog.naver']",
+        "a[href*='cafe.naver']",
+    ]
+    
+    for selector in link_selectors:
+        links = section.find_elements(By.CSS_SELECTOR, selector)
+        for link in links:
+            if link.is_displayed() and link not in content_links:
                 href = link.get_attribute("href") or ""
                 text = link.text.strip()
                 
-                # 유효한 콘텐츠 링크이고 충분한 텍스트
                 if is_valid_content_link(href) and len(text) > 5:
-                    # UI 요소 제외
-                    if not any(skip in text for skip in ["더보기", "설정", "옵션", "필터", "전체"]):
-                        if link not in content_links:
-                            content_links.append(link)
+                    content_links.append(link)
+    return content_links
+
+def links_from_all_anchors(section):
+    """3. 그래도 없으면 모든 링크 확인 (최후 수단)"""
+    content_links = []
+    all_links = section.find_elements(By.TAG_NAME, 'a')
+    
+    for link in all_links:
+        if not link.is_displayed():
+            continue
+        
+        # 너무 작은 링크 제외
+        if link.size['height'] < 10 or link.size['width'] < 10:
+            continue
         
+        href = link.get_attribute("href") or ""
+        text = link.text.strip()
+        
+        # 유효한 콘텐츠 링크이고 충분한 텍스트
+        if is_valid_content_link(href) and len(text) > 5:
+            # UI 요소 제외
+            if not any(skip in text for skip in ["더보기", "설정", "옵션", "필터", "전체"]):
+                if link not in content_links:
+                    content_links.append(link)
+    return content_links
+
+LINK_STRATEGIES = [
+    ("text_container", links_from_text_containers),
+    ("anchor_scan", links_from_anchor_scan),
+    ("selectors", links_from_selectors),
+    ("all_anchors", links_from_all_anchors),
+]
+
+def extract_content_links(section, fingerprint=None):
+    """실제 보이는 게시물 링크만 정확히 추출
+    fingerprint 가 있으면 같은 레이아웃에서 지난번에 링크를 찾은 전략부터 시도하고,
+    실패할 때만 나머지 단계를 순서대로 탄다.
+    """
+    learned = strategy_cache.get(fingerprint, "links")
+    strategies = dict(LINK_STRATEGIES)
+    if learned in strategies:
+        try:
+            content_links = strategies[learned](section)
+        except Exception as e:
+            print(f"링크 추출 오류: {e}")
+            content_links = []
+        if content_links:
+            strategy_cache.record(fingerprint, "links", learned, hit=True)
+            return content_links
+
+    try:
+        for name, strategy in LINK_STRATEGIES:
+            if name == learned:
+                continue
+            content_links = strategy(section)
+            if content_links:
+                strategy_cache.record(fingerprint, "links", name, hit=False)
+                return content_links
     except Exception as e:
         print(f"링크 추출 오류: {e}")
     
-    return content_links
\ No newline at end of file
+    return []
@@ -0,0 +1,106 @@
+# app/keyword/strategy.py
+
+import os
+import re
+import json
+import atexit
+import hashlib
+import threading
+
+# 섹션 레이아웃(클래스 구조)마다 어떤 링크 추출 전략/제목 규칙이 통했는지 기억해 두는 저장소.
+# 다음 확인부터는 기억해 둔 전략을 먼저 쓰고, 실패할 때만 전체 단계(cascade)를 다시 탄다.
+# 내용은 JSON 파일로 저장되어 재시작 후에도 유지된다.
+
+STRATEGY_CACHE_PATH = os.environ.get('STRATEGY_CACHE_PATH') or os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'instance', 'strategy_cache.json')
+SAVE_EVERY = 20  # 이만큼 바뀌면 파일에 저장 (종료 시에도 저장)
+
+# 섹션 구조를 브라우저 안에서 한 번에 요약 (WebDriver 왕복 한 번)
+FINGERPRINT_SCRIPT = """
+const s = arguments[0];
+const cls = e => (typeof e.className === 'string' ? e.className : '');
+const children = Array.from(s.children).slice(0, 6).map(c => c.tagName + '.' + cls(c)).join('|');
+return [
+    s.tagName, cls(s), children,
+    !!s.querySelector("div[class*='text-container']"),
+    !!s.querySelector('li'),
+].join('#');
+"""
+
+
+def section_fingerprint(section):
+    """섹션의 클래스 구조 요약을 짧은 해시로 (숫자는 지워서 color_5/color_3 같은 변형을 같은 레이아웃으로 봄)"""
+    try:
+        signature = section.parent.execute_script(FINGERPRINT_SCRIPT, section)
+    except Exception:
+        return None
+    signature = re.sub(r'\d+', '', signature or '')
+    return hashlib.md5(signature.encode('utf-8')).hexdigest()[:16]
+
+
+class StrategyCache:
+    def __init__(self, path=STRATEGY_CACHE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._entries = None  # fingerprint -> {'links': 전략 이름, 'title': 규칙 이름}
+        self._dirty = 0
+        self.hits = 0
+        self.misses = 0
+
+    def _load(self):
+        if self._entries is not None:
+            return
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                self._entries = json.load(f)
+        except (OSError, ValueError):
+            self._entries = {}
+
+    def get(self, fingerprint, kind):
+        if not fingerprint:
+            return None
+        with self._lock:
+            self._load()
+            return self._entries.get(fingerprint, {}).get(kind)
+
+    def record(self, fingerprint, kind, name, hit):
+        """kind('links'/'title')에 대해 이긴 전략 이름을 기억"""
+        if not fingerprint:
+            return
+        with self._lock:
+            self._load()
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+            entry = self._entries.setdefault(fingerprint, {})
+            if entry.get(kind) != name:
+                entry[kind] = name
+                self._dirty += 1
+            should_save = self._dirty >= SAVE_EVERY
+        if should_save:
+            self.save()
+
+    def save(self):
+        with self._lock:
+            if not self._dirty or self._entries is None:
+                return
+            data = json.dumps(self._entries, ensure_ascii=False, sort_keys=True)
+            self._dirty = 0
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(data)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"추출 전략 저장 실패: {e}")
+
+    def stats(self):
+        with self._lock:
+            self._load()
+            return {'layouts': len(self._entries), 'hits': self.hits, 'misses': self.misses}
+
+
+strategy_cache = StrategyCache()
+atexit.register(strategy_cache.save)
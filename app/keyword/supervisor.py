@@ -0,0 +1,207 @@
+# app/keyword/supervisor.py
+
+import os
+import time
+import threading
+import psutil
+
+# 스크래퍼가 띄운 chromedriver/chrome 프로세스를 추적하는 감시자.
+# - 브라우저별 RSS 를 측정해서 메모리 상한/수명 초과 시 재시작(또는 종료) 대상으로 표시
+# - 부모 프로세스가 죽어서 남겨진(고아) 크롬 프로세스를 시작 시점과 주기적으로 정리
+# - 모니터링용으로 개수와 메모리 사용량을 제공
+
+# 우리가 띄운 크롬인지 구분하기 위해 명령행에 붙이는 표식 (크롬은 모르는 스위치를 무시함)
+PROCESS_MARKER = "--keyword-service-scraper"
+
+BROWSER_MAX_RSS_MB = float(os.environ.get('BROWSER_MAX_RSS_MB') or 1024)
+BROWSER_MAX_AGE_SECONDS = float(os.environ.get('BROWSER_MAX_AGE_SECONDS') or 1800)
+BROWSER_REAP_INTERVAL = float(os.environ.get('BROWSER_REAP_INTERVAL') or 60)  # 0이면 주기 실행 안 함
+
+
+def kill_tree(pid):
+    """pid 와 그 자식 프로세스를 모두 강제 종료"""
+    try:
+        root = psutil.Process(pid)
+        procs = root.children(recursive=True) + [root]
+    except psutil.Error:
+        return 0
+    killed = 0
+    for proc in procs:
+        try:
+            proc.kill()
+            killed += 1
+        except psutil.Error:
+            pass
+    psutil.wait_procs(procs, timeout=3)
+    return killed
+
+
+def tree_rss(pid):
+    """pid 와 자식 프로세스들의 RSS 합계(바이트)"""
+    try:
+        root = psutil.Process(pid)
+        procs = [root] + root.children(recursive=True)
+    except psutil.Error:
+        return 0
+    total = 0
+    for proc in procs:
+        try:
+            total += proc.memory_info().rss
+        except psutil.Error:
+            pass
+    return total
+
+
+def driver_pid(driver):
+    try:
+        return driver.service.process.pid
+    except Exception:
+        return None
+
+
+class BrowserSupervisor:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._browsers = {}  # chromedriver pid -> {'kind', 'started_at', 'rss'}
+        self._timer = None
+        self.reaped_total = 0
+        self.recycled_total = 0
+
+    # --- 추적 ---
+    def register(self, driver, kind="check"):
+        """kind: 'check'(확인 한 건용 일회성 브라우저) 또는 'pool'(TabPool 의 장기 브라우저)"""
+        pid = driver_pid(driver)
+        if pid:
+            with self._lock:
+                self._browsers[pid] = {'kind': kind, 'started_at': time.monotonic(), 'rss': 0}
+        return pid
+
+    def unregister(self, driver):
+        pid = driver_pid(driver)
+        with self._lock:
+            self._browsers.pop(pid, None)
+
+    def should_recycle(self, driver):
+        """재시작이 필요하면 이유 문자열, 아니면 None"""
+        pid = driver_pid(driver)
+        if not pid or not psutil.pid_exists(pid):
+            return "종료됨"
+        with self._lock:
+            info = self._browsers.get(pid)
+        if info and time.monotonic() - info['started_at'] > BROWSER_MAX_AGE_SECONDS:
+            return "수명 초과"
+        if tree_rss(pid) > BROWSER_MAX_RSS_MB * 1024 * 1024:
+            return "메모리 초과"
+        return None
+
+    def mark_recycled(self):
+        with self._lock:
+            self.recycled_total += 1
+
+    # --- 주기 작업 ---
+    def sample(self):
+        """추적 중인 브라우저의 RSS 를 갱신하고, 메모리 상한을 넘은 일회성 브라우저는 종료"""
+        with self._lock:
+            pids = list(self._browsers)
+        for pid in pids:
+            if not psutil.pid_exists(pid):
+                with self._lock:
+                    self._browsers.pop(pid, None)
+                continue
+            rss = tree_rss(pid)
+            with self._lock:
+                info = self._browsers.get(pid)
+                if info:
+                    info['rss'] = rss
+            # 장기 브라우저(pool)는 TabPool 이 탭이 빌 때 직접 재시작함
+            if info and info['kind'] == "check" and rss > BROWSER_MAX_RSS_MB * 1024 * 1024:
+                print(f"🧹 브라우저 pid={pid} 메모리 {rss // 1024 // 1024}MB 초과로 종료")
+                kill_tree(pid)
+                self.mark_recycled()
+
+    def reap_orphans(self):
+        """부모가 사라진 chromedriver 와 표식이 붙은 크롬 프로세스를 정리"""
+        reaped = 0
+        with self._lock:
+            tracked = set(self._browsers)
+        for proc in psutil.process_iter(['pid', 'name', 'cmdline']):
+            if proc.pid in tracked:
+                continue  # 지금 확인에 쓰고 있는 브라우저
+            try:
+                name = (proc.info['name'] or "").lower()
+                cmdline = proc.info['cmdline'] or []
+                if "chromedriver" in name:
+                    # 우리 크롬(표식)을 자식으로 가진 chromedriver 중 부모가 사라진 것
+                    ours = any(PROCESS_MARKER in (child.cmdline() or []) for child in proc.children())
+                    if ours and _is_orphan(proc):
+                        reaped += kill_tree(proc.pid)
+                elif PROCESS_MARKER in cmdline:
+                    # chromedriver 없이 남은 크롬 (부모 chromedriver 가 먼저 죽은 경우)
+                    parent = proc.parent()
+                    if parent is None or "chromedriver" not in (parent.name() or "").lower():
+                        if parent is None or PROCESS_MARKER not in (parent.cmdline() or []):
+                            reaped += kill_tree(proc.pid)
+            except psutil.Error:
+                continue
+        if reaped:
+            print(f"🧹 고아 크롬 프로세스 {reaped}개 정리")
+            with self._lock:
+                self.reaped_total += reaped
+        return reaped
+
+    def run_once(self):
+        try:
+            self.reap_orphans()
+            self.sample()
+        except Exception as e:
+            print(f"브라우저 감시 중 오류: {e}")
+
+    def start(self, interval=BROWSER_REAP_INTERVAL):
+        """시작 시 한 번 정리하고, interval 초마다 반복"""
+        self.run_once()
+        if interval <= 0 or self._timer:
+            return
+
+        def loop():
+            while True:
+                time.sleep(interval)
+                self.run_once()
+
+        self._timer = threading.Thread(target=loop, name="browser-supervisor", daemon=True)
+        self._timer.start()
+
+    def stats(self):
+        with self._lock:
+            browsers = [
+                {
+                    'pid': pid,
+                    'kind': info['kind'],
+                    'age_seconds': round(time.monotonic() - info['started_at'], 1),
+                    'rss_mb': round(info['rss'] / 1024 / 1024, 1),
+                }
+                for pid, info in self._browsers.items()
+            ]
+            return {
+                'tracked': len(browsers),
+                'total_rss_mb': round(sum(b['rss_mb'] for b in browsers), 1),
+                'reaped_total': self.reaped_total,
+                'recycled_total': self.recycled_total,
+                'max_rss_mb': BROWSER_MAX_RSS_MB,
+                'max_age_seconds': BROWSER_MAX_AGE_SECONDS,
+                'browsers': browsers,
+            }
+
+
+def _is_orphan(proc):
+    """부모가 init(1)으로 바뀌었거나 이미 없는 경우
+    (컨테이너에서 앱 자신이 PID 1 이면 우리가 띄운 브라우저도 부모가 1이므로 제외)"""
+    try:
+        parent = proc.parent()
+    except psutil.Error:
+        return True
+    if parent is None:
+        return True
+    return parent.pid == 1 and parent.pid != os.getpid()
+
+
+supervisor = BrowserSupervisor()
@@ -0,0 +1,192 @@
+# app/keyword/tabs.py
+
+import time
+import atexit
+import threading
+import traceback
+from . import metrics
+from .supervisor import supervisor
+from .scraper import (
+    create_driver, quit_driver, search_url, scan_sections, complete_results, timeout_results,
+    page_fingerprint, reuse_if_unchanged, kill_browser,
+    Deadline, CheckTimeout, CHECK_DEADLINE_SECONDS, FAILED_STATUS,
+)
+
+# 크롬 프로세스 하나를 여러 탭으로 나눠 쓰는 실행 모드.
+# 탭마다 별도의 브라우저 컨텍스트(쿠키/스토리지 분리)를 만들고, 페이지 로딩은 탭끼리 동시에 진행한다.
+# WebDriver 세션은 한 번에 한 명령만 처리하므로 "탭 전환 + 명령"은 잠금으로 묶어서 실행한다.
+
+READY_SCRIPT = "return document.readyState !== 'loading' && !!document.getElementById('main_pack')"
+
+
+class TabPool:
+    """브라우저 하나에서 최대 max_tabs 개의 확인을 동시에 수행"""
+
+    def __init__(self, max_tabs=3):
+        self.max_tabs = max_tabs
+        self.checks_done = 0
+        self._lock = threading.RLock()
+        self._slots = threading.BoundedSemaphore(max_tabs)
+        self._state = threading.Condition()
+        self._active = 0             # 지금 열려 있는 탭 수
+        self._recycle_reason = None  # 재시작 대기 중이면 그 이유
+        self._closed = False
+        self._start_browser()
+
+    def _start_browser(self):
+        self.driver = create_driver(kind="pool")
+        # 탭 안의 스크립트가 멈춰도 명령이 끝없이 잠금을 붙잡지 않도록
+        self.driver.set_script_timeout(CHECK_DEADLINE_SECONDS)
+        self.home = self.driver.current_window_handle
+        self.started_at = time.monotonic()
+
+    def _enter(self):
+        """탭을 열기 전 호출: 브라우저가 메모리/수명 상한을 넘었으면 열린 탭이 모두 끝난 뒤 재시작"""
+        with self._state:
+            if not self._recycle_reason:
+                self._recycle_reason = supervisor.should_recycle(self.driver)
+            while self._recycle_reason and self._active > 0:
+                self._state.wait()
+            if self._recycle_reason:
+                print(f"♻️ 탭 풀 브라우저 재시작 ({self._recycle_reason})")
+                # 새 브라우저 실행에 실패하면 재시작 이유가 남아 있으므로 다음 확인에서 다시 시도함
+                with self._lock:
+                    quit_driver(self.driver)
+                    self._start_browser()
+                supervisor.mark_recycled()
+                self._recycle_reason = None
+            self._active += 1
+
+    def _leave(self):
+        with self._state:
+            self._active -= 1
+            self._state.notify_all()
+
+    def _kill_hung(self, driver, keyword):
+        """확인 하나가 예산을 넘겨 멈춰 있으면 브라우저를 종료해서 잠금을 풀어 줌
+        (다른 탭의 확인은 실패로 끝나고, 다음 _enter 에서 브라우저가 재시작됨)"""
+        if driver is self.driver:
+            print(f"⏱ [{keyword}] 탭 모드 확인이 응답하지 않아 탭 풀 브라우저를 종료")
+            kill_browser(driver)
+
+    def _cdp(self, cmd, params):
+        return self.driver.execute_cdp_cmd(cmd, params)
+
+    def _open_tab(self):
+        """격리된 브라우저 컨텍스트에 빈 탭을 만들고 (컨텍스트 id, 탭 핸들) 반환"""
+        with self._lock:
+            context_id = self._cdp("Target.createBrowserContext", {"disposeOnDetach": False})["browserContextId"]
+            target_id = self._cdp("Target.createTarget", {
+                "url": "about:blank", "browserContextId": context_id, "width": 1280, "height": 2200,
+            })["targetId"]
+        # chromedriver 의 창 핸들은 DevTools target id 와 같음
+        return context_id, target_id
+
+    def _close_tab(self, context_id, target_id):
+        with self._lock:
+            try:
+                self._cdp("Target.closeTarget", {"targetId": target_id})
+                self._cdp("Target.disposeBrowserContext", {"browserContextId": context_id})
+            finally:
+                self.driver.switch_to.window(self.home)
+
+    def _in_tab(self, handle, fn, *args):
+        """잠금을 잡고 해당 탭으로 전환한 뒤 fn(driver, ...) 실행"""
+        with self._lock:
+            self.driver.switch_to.window(handle)
+            return fn(self.driver, *args)
+
+    def check(self, keyword, targets, deep=False, deep_depth=None, deadline_seconds=None,
+              previous=None, page_info=None):
+        """run_check_many 와 같은 결과를 탭 하나에서 만들어 냄"""
+        with self._slots:
+            print(f"--- '{keyword}' 탭 모드 순위 확인 시작 (대상 {len(targets)}개) ---")
+            deadline = Deadline(deadline_seconds or CHECK_DEADLINE_SECONDS)
+            started = time.monotonic()
+            outcome = "failed"
+            results = [None] * len(targets)
+            scanned_sections = []
+            tab = None
+            entered = False
+            watchdog = None
+            try:
+                self._enter()
+                entered = True
+                # 탭 하나가 멈추면 잠금을 쥔 채 다른 탭과 재시작까지 막으므로, 예산을 넘기면 브라우저를 끊음
+                watchdog = threading.Timer(deadline.remaining() + 5, self._kill_hung, args=(self.driver, keyword))
+                watchdog.daemon = True
+                watchdog.start()
+
+                tab = self._open_tab()
+                handle = tab[1]
+
+                # 이동 명령만 걸어 두고 잠금을 풀어서 다른 탭의 로딩과 겹치게 함
+                self._in_tab(handle, lambda d: d.execute_script("window.location.href = arguments[0]", search_url(keyword)))
+                while not self._in_tab(handle, lambda d: d.execute_script(READY_SCRIPT)):
+                    deadline.sleep(0.3)
+                deadline.sleep(1.0)
+
+                self._in_tab(handle, lambda d: d.execute_script("window.scrollTo(0, document.body.scrollHeight)"))
+                deadline.sleep(1.5)
+
+                fingerprint = self._in_tab(handle, page_fingerprint)
+                reused = reuse_if_unchanged(keyword, fingerprint, previous, deep, page_info)
+                if reused is None:
+                    # 섹션 추출은 DOM 명령이 많으므로 한 번에 잠금을 잡고 수행
+                    self._in_tab(handle, scan_sections, keyword, targets, results, deadline, scanned_sections)
+                else:
+                    results[:] = reused
+                    if all(results):
+                        outcome = "unchanged"
+                        return results
+
+                def release_tab():
+                    nonlocal tab
+                    self._close_tab(*tab)
+                    tab = None
+
+                results = complete_results(keyword, targets, results, deep, deep_depth, deadline, release_tab)
+                outcome = "found" if any(result[1] != 999 for result in results) else "not_found"
+                return results
+
+            except Exception as e:
+                if isinstance(e, CheckTimeout) or deadline.expired():
+                    outcome = "timeout"
+                    return timeout_results(keyword, results, scanned_sections)
+                print(f"🚨 [{keyword}] 탭 모드 순위 확인 중 오류 발생: {str(e)}")
+                traceback.print_exc()
+                return [(FAILED_STATUS, 999, None)] * len(targets)
+            finally:
+                if watchdog:
+                    watchdog.cancel()
+                if tab:
+                    try:
+                        self._close_tab(*tab)
+                    except Exception:
+                        pass
+                with self._lock:
+                    self.checks_done += 1
+                if entered:
+                    self._leave()
+                metrics.record_check(outcome, time.monotonic() - started)
+                print(f"--- '{keyword}' 탭 모드 순위 확인 완료 ---\n")
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        quit_driver(self.driver)
+
+
+_shared_pool = None
+_shared_lock = threading.Lock()
+
+
+def shared_tab_pool(max_tabs):
+    """프로세스 안에서 공유하는 TabPool (BROWSER_TABS 설정 시 run_check_many 가 사용)"""
+    global _shared_pool
+    with _shared_lock:
+        if _shared_pool is None:
+            _shared_pool = TabPool(max_tabs)
+            atexit.register(_shared_pool.close)
+        return _shared_pool
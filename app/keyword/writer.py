@@ -0,0 +1,196 @@
+# app/keyword/writer.py
+
+import os
+import time
+import atexit
+import threading
+from sqlalchemy.exc import DBAPIError, OperationalError, InterfaceError
+from app.models import db, Keyword, SearchQuery
+
+# 순위 확인 결과를 모아 두었다가 한 번에 저장하는 write-behind 기록기.
+# 확인이 한꺼번에 끝날 때 키워드마다 트랜잭션을 여는 대신, 일정 개수나 시간마다 bulk update 로 반영한다.
+# 같은 키워드의 결과가 여러 번 쌓이면 마지막 결과만 저장한다.
+
+# DB 잠금/연결 끊김 같은 일시적 오류는 버리지 않고 간격을 늘려 가며 계속 재시도하고,
+# 특정 행 때문에 실패한 경우에만 한 건씩 나눠 저장해서 그 행만 MAX_ATTEMPTS 번 뒤에 버린다.
+MAX_ATTEMPTS = 3
+MAX_BACKOFF_SECONDS = 30.0
+
+
+class ResultWriter:
+    def __init__(self, app=None):
+        self.app = None
+        self.flush_size = 50
+        self.flush_interval = 2.0
+        self._keywords = {}   # keyword_id -> 갱신할 컬럼 dict
+        self._queries = {}    # search_query_id -> 갱신할 컬럼 dict
+        self._attempts = {}   # (모델 이름, id) -> 행 단위 저장 실패 횟수
+        self._backoff = 0.0   # 일시적 오류 뒤 다음 저장까지 기다릴 시간 (0이면 평소대로)
+        self._cond = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+        self._closed = False
+        self.flushed_total = 0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.app = app
+        self.flush_size = app.config.get('RESULT_FLUSH_SIZE', self.flush_size)
+        self.flush_interval = app.config.get('RESULT_FLUSH_INTERVAL', self.flush_interval)
+        atexit.register(self.close)
+
+    def _ensure_started(self):
+        # gunicorn 처럼 fork 하는 서버에서는 자식 프로세스마다 flush 스레드를 새로 띄워야 함
+        if self._thread is None or self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name="result-writer", daemon=True)
+            self._thread.start()
+
+    def submit(self, keyword_rows, query_rows=()):
+        """keyword_rows/query_rows: [{'id': ..., 컬럼: 값, ...}, ...]"""
+        with self._cond:
+            if self._closed:
+                # 종료 중이면 버퍼에 넣지 않고 바로 저장
+                self._keywords.update({row['id']: row for row in keyword_rows})
+                self._queries.update({row['id']: row for row in query_rows})
+            else:
+                self._ensure_started()
+                for row in keyword_rows:
+                    self._keywords[row['id']] = row
+                for row in query_rows:
+                    self._queries[row['id']] = row
+                if len(self._keywords) >= self.flush_size:
+                    self._cond.notify()
+                return
+        self.flush()
+
+    @property
+    def pending(self):
+        with self._cond:
+            return len(self._keywords) + len(self._queries)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                # 일시적 오류로 물러나 있는 동안에는 개수가 차도 바로 저장하지 않음
+                self._cond.wait_for(lambda: self._closed or (not self._backoff and len(self._keywords) >= self.flush_size),
+                                    timeout=self._backoff or self.flush_interval)
+                if self._closed:
+                    return
+            self.flush()
+
+    def flush(self):
+        """버퍼에 쌓인 결과를 한 트랜잭션으로 저장"""
+        with self._flush_lock:
+            with self._cond:
+                keyword_rows = list(self._keywords.values())
+                query_rows = list(self._queries.values())
+                self._keywords.clear()
+                self._queries.clear()
+            if not keyword_rows and not query_rows:
+                return 0
+
+            with self.app.app_context():
+                try:
+                    # 확인 후 저장 전에 삭제된 행이 있으면 bulk update 전체가 실패하므로 남아 있는 행만 갱신
+                    keyword_rows = _existing_rows(Keyword, keyword_rows)
+                    query_rows = _existing_rows(SearchQuery, query_rows)
+                    db.session.bulk_update_mappings(Keyword, keyword_rows)
+                    db.session.bulk_update_mappings(SearchQuery, query_rows)
+                    db.session.commit()
+                    written = len(keyword_rows)
+                    with self._cond:
+                        self._backoff = 0.0
+                except Exception as e:
+                    db.session.rollback()
+                    if _is_transient(e):
+                        self._retry_later(keyword_rows, query_rows, e)
+                        return 0
+                    print(f"결과 일괄 저장 실패 ({len(keyword_rows)}건), 한 건씩 다시 저장: {e}")
+                    written = self._flush_rows(Keyword, self._keywords, keyword_rows)
+                    self._flush_rows(SearchQuery, self._queries, query_rows)
+                finally:
+                    db.session.remove()
+
+            self.flushed_total += written
+            print(f"결과 {written}건 일괄 저장 완료")
+            return written
+
+    def _retry_later(self, keyword_rows, query_rows, error):
+        """일시적 오류: 모든 행을 되돌려 놓고 저장 간격을 늘림 (버리지 않음)"""
+        with self._cond:
+            # 그 사이 들어온 더 새로운 결과는 덮어쓰지 않도록 없는 것만 되돌려 놓음
+            for row in keyword_rows:
+                self._keywords.setdefault(row['id'], row)
+            for row in query_rows:
+                self._queries.setdefault(row['id'], row)
+            self._backoff = min(max(self._backoff * 2, self.flush_interval), MAX_BACKOFF_SECONDS)
+            backoff = self._backoff
+        print(f"결과 일괄 저장 실패 ({len(keyword_rows)}건), {backoff:.0f}초 뒤 다시 시도: {error}")
+
+    def _flush_rows(self, model, buffer, rows):
+        """한 건씩 저장해서 문제 있는 행만 골라냄 (그 행은 MAX_ATTEMPTS 번 실패하면 버림)"""
+        written = 0
+        for index, row in enumerate(rows):
+            key = (model.__name__, row['id'])
+            try:
+                db.session.bulk_update_mappings(model, [row])
+                db.session.commit()
+                written += 1
+                with self._cond:
+                    self._attempts.pop(key, None)
+            except Exception as e:
+                db.session.rollback()
+                if _is_transient(e):
+                    # 도중에 DB 가 잠기면 남은 행은 통째로 나중에 다시 시도
+                    if model is Keyword:
+                        self._retry_later(rows[index:], [], e)
+                    else:
+                        self._retry_later([], rows[index:], e)
+                    break
+                with self._cond:
+                    self._attempts[key] = self._attempts.get(key, 0) + 1
+                    if self._attempts[key] < MAX_ATTEMPTS:
+                        buffer.setdefault(row['id'], row)
+                        continue
+                    del self._attempts[key]
+                print(f"{model.__name__} id={row['id']} 결과는 {MAX_ATTEMPTS}번 저장에 실패해서 버림: {e}")
+        return written
+
+    def close(self):
+        """종료 시 남은 결과를 모두 저장"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if self.app is None:
+            return
+        # 종료 직전에 DB 가 잠겨 있을 수 있으므로 몇 번 더 기다렸다가 시도
+        for _ in range(MAX_ATTEMPTS):
+            self.flush()
+            if not self.pending:
+                return
+            time.sleep(self._backoff or self.flush_interval)
+        print(f"종료 시 저장하지 못한 결과 {self.pending}건")
+
+
+def _is_transient(error):
+    """DB 잠금/연결 끊김처럼 잠시 뒤 다시 하면 되는 오류인지"""
+    if isinstance(error, (OperationalError, InterfaceError)):
+        return True
+    return isinstance(error, DBAPIError) and error.connection_invalidated
+
+
+def _existing_rows(model, rows):
+    """아직 DB 에 남아 있는 id 의 행만 골라냄"""
+    if not rows:
+        return rows
+    ids = [row['id'] for row in rows]
+    existing = set(db.session.scalars(db.select(model.id).where(model.id.in_(ids))))
+    if len(existing) < len(ids):
+        print(f"삭제된 {model.__name__} {len(ids) - len(existing)}건의 결과는 저장하지 않음")
+    return [row for row in rows if row['id'] in existing]
+
+
+result_writer = ResultWriter()
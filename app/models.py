@@ -1,5 +1,6 @@
 # app/models.py
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy.exc import IntegrityError
 
 db = SQLAlchemy()
 
@@ -8,6 +9,34 @@ class User(db.Model):
     email = db.Column(db.String(120), unique=True, nullable=False)
     password = db.Column(db.String(200), nullable=False)
 
+def normalize_query(text):
+    """검색어 정규화: 앞뒤/중복 공백 제거 + 소문자 (같은 검색 결과를 보는 키워드끼리 묶기 위함)"""
+    return " ".join((text or "").split()).lower()
+
+class SearchQuery(db.Model):
+    """여러 사용자가 공유하는 정규화된 검색어. 스크래핑은 이 단위로 한 번만 수행"""
+    id = db.Column(db.Integer, primary_key=True)
+    query_text = db.Column(db.String(100), unique=True, nullable=False)
+    last_checked_at = db.Column(db.DateTime, nullable=True)
+    page_fingerprint = db.Column(db.String(16), nullable=True)  # 마지막으로 본 검색 결과 페이지 구조 지문
+    volatility = db.Column(db.Float, nullable=True)  # 페이지가 바뀌는 정도 (0~1, 확인할 때마다 갱신)
+    keywords = db.relationship('Keyword', backref='search_query', lazy='dynamic')
+
+    @classmethod
+    def get_or_create(cls, text):
+        query_text = normalize_query(text)
+        search_query = cls.query.filter_by(query_text=query_text).first()
+        if not search_query:
+            try:
+                # 저장점 안에서 넣어서, 실패해도 호출한 쪽의 트랜잭션은 그대로 유지
+                with db.session.begin_nested():
+                    search_query = cls(query_text=query_text)
+                    db.session.add(search_query)
+            except IntegrityError:
+                # 다른 요청이 같은 검색어를 먼저 만든 경우 그 행을 사용
+                search_query = cls.query.filter_by(query_text=query_text).one()
+        return search_query
+
 class Keyword(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
@@ -18,4 +47,6 @@ class Keyword(db.Model):
     priority = db.Column(db.String(10), nullable=False, default='중')
     ranking = db.Column(db.Integer, nullable=True) # <-- 이 줄을 추가하세요
     section = db.Column(db.String(100), nullable=True) # <-- 이 줄만 추가하시면 됩니다.
-    post_title = db.Column(db.String(200), nullable=True)  # 새로 추가
\ No newline at end of file
+    post_title = db.Column(db.String(200), nullable=True)  # 새로 추가
+    search_query_id = db.Column(db.Integer, db.ForeignKey('search_query.id'), nullable=True, index=True)
+    page_fingerprint = db.Column(db.String(16), nullable=True)  # 현재 순위 결과를 만든 페이지의 지문
\ No newline at end of file
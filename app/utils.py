@@ -1,13 +1,98 @@
 # app/utils.py
 import json
-from flask import Response
+import gzip
+import zlib
+from flask import Response, request, has_request_context, stream_with_context
+
+# orjson 이 설치되어 있으면 더 빠른 인코더를 사용 (없으면 표준 json)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+JSON_MIMETYPE = 'application/json; charset=utf-8'
+COMPRESS_MIN_SIZE = 1024   # 이 크기(바이트) 미만의 응답은 압축하지 않음
+COMPRESS_LEVEL = 6
+STREAM_CHUNK_ROWS = 500    # 스트리밍 시 한 번에 내보내는 항목 수
+
+
+def dumps(data):
+    """한글을 그대로 둔 UTF-8 JSON 바이트로 직렬화"""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def accepts_gzip():
+    """요청의 Accept-Encoding 에 gzip 이 허용되어 있는지"""
+    if not has_request_context():
+        return False
+    return request.accept_encodings['gzip'] > 0
+
 
 def json_response(data, status=200):
     """
     한글이 깨지지 않는 커스텀 JSON 응답 함수
+    클라이언트가 gzip 을 받을 수 있고 본문이 COMPRESS_MIN_SIZE 이상이면 압축해서 보냄
+    """
+    body = dumps(data)
+    headers = {}
+    if len(body) >= COMPRESS_MIN_SIZE:
+        headers['Vary'] = 'Accept-Encoding'
+        if accepts_gzip():
+            body = gzip.compress(body, compresslevel=COMPRESS_LEVEL)
+            headers['Content-Encoding'] = 'gzip'
+    return Response(
+        body,
+        status=status,
+        headers=headers,
+        mimetype=JSON_MIMETYPE
+    )
+
+
+def json_stream_response(key, items, extra=None, status=200):
     """
+    큰 목록을 {"key": [...], ...extra} 형태로 나눠서 스트리밍하는 응답
+    items 는 dict 를 하나씩 돌려주는 iterable (예: 쿼리 결과를 변환하는 generator)
+    """
+    gzip_enabled = accepts_gzip()
+
+    def generate():
+        # 압축 시 gzip 헤더가 붙는 zlib 스트림(wbits=31)을 조각마다 flush
+        compressor = zlib.compressobj(COMPRESS_LEVEL, zlib.DEFLATED, 31) if gzip_enabled else None
+
+        def emit(chunk):
+            if compressor is None:
+                return chunk
+            return compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+
+        yield emit(b'{' + dumps(key) + b':[')
+        buffer = []
+        first = True
+        for item in items:
+            buffer.append(dumps(item))
+            if len(buffer) >= STREAM_CHUNK_ROWS:
+                yield emit((b'' if first else b',') + b','.join(buffer))
+                first = False
+                buffer = []
+        if buffer:
+            yield emit((b'' if first else b',') + b','.join(buffer))
+
+        tail = b']'
+        for extra_key, value in (extra or {}).items():
+            tail += b',' + dumps(extra_key) + b':' + dumps(value)
+        tail += b'}'
+        if compressor is None:
+            yield tail
+        else:
+            yield compressor.compress(tail) + compressor.flush()
+
+    headers = {'Vary': 'Accept-Encoding'}
+    if gzip_enabled:
+        headers['Content-Encoding'] = 'gzip'
     return Response(
-        json.dumps(data, ensure_ascii=False),
+        stream_with_context(generate()),
         status=status,
-        mimetype='application/json; charset=utf-8'
-    )
\ No newline at end of file
+        headers=headers,
+        mimetype=JSON_MIMETYPE
+    )
@@ -0,0 +1,102 @@
+# bench_json.py
+# 키워드 목록 응답의 크기와 직렬화 시간을 비교하는 벤치마크.
+#
+#   python bench_json.py --rows 1000,10000,100000
+#
+# 기존 방식(json.dumps, 무압축)과 app.utils 의 인코더/gzip/스트리밍 결과를 나란히 출력한다.
+
+import sys
+import json
+import gzip
+import time
+import argparse
+from datetime import datetime
+
+from flask import Flask
+
+from app import utils
+
+SAMPLE_KEYWORDS = ["치열연고", "항문소양증", "강남 피부과 추천", "여드름 흉터 레이저", "다이어트 한약 후기"]
+
+
+def make_rows(count):
+    """실제 키워드 목록과 비슷한 모양(한글 키워드, 긴 post_url)의 가짜 데이터"""
+    now = datetime(2026, 10, 19, 9, 30).isoformat()
+    rows = []
+    for i in range(count):
+        keyword = SAMPLE_KEYWORDS[i % len(SAMPLE_KEYWORDS)]
+        rows.append({
+            'id': i + 1,
+            'keyword_text': f"{keyword} {i % 97}",
+            'post_url': f"https://blog.naver.com/PostView.naver?blogId=user{i % 5000}&logNo=22{i:010d}&redirect=Dlog&widgetTypeCall=true&directAccess=false",
+            'post_title': f"{keyword} 솔직 후기와 관리 방법 정리 #{i}",
+            'priority': "상중하"[i % 3],
+            'ranking_status': "인기글" if i % 4 else "노출X",
+            'ranking': (i % 10) + 1 if i % 4 else 999,
+            'section': "건강·의학 인기글" if i % 4 else None,
+            'last_checked_at': now,
+        })
+    return rows
+
+
+def timed(fn, repeat):
+    best = None
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def bench(rows, app, repeat):
+    payload = {'keywords': rows}
+
+    stdlib_time, stdlib_body = timed(lambda: json.dumps(payload, ensure_ascii=False).encode('utf-8'), repeat)
+    fast_time, fast_body = timed(lambda: utils.dumps(payload), repeat)
+    gzip_time, gzip_body = timed(lambda: gzip.compress(fast_body, compresslevel=utils.COMPRESS_LEVEL), repeat)
+
+    def stream():
+        with app.test_request_context(headers={'Accept-Encoding': 'gzip'}):
+            response = utils.json_stream_response('keywords', iter(rows))
+            return b''.join(response.response)
+
+    stream_time, stream_body = timed(stream, repeat)
+    assert json.loads(gzip.decompress(stream_body)) == json.loads(stdlib_body)
+
+    return {
+        'rows': len(rows),
+        'stdlib_kb': len(stdlib_body) / 1024,
+        'stdlib_ms': stdlib_time * 1000,
+        'fast_kb': len(fast_body) / 1024,
+        'fast_ms': fast_time * 1000,
+        'gzip_kb': len(gzip_body) / 1024,
+        'gzip_ms': (fast_time + gzip_time) * 1000,
+        'stream_gzip_kb': len(stream_body) / 1024,
+        'stream_gzip_ms': stream_time * 1000,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="json_response 크기/속도 벤치마크")
+    parser.add_argument("--rows", default="1000,10000,100000")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    app = Flask(__name__)
+    encoder = "orjson" if utils.orjson is not None else "json (orjson 미설치)"
+    print(f"인코더: {encoder}, gzip level {utils.COMPRESS_LEVEL}, 반복 {args.repeat}회 중 최솟값\n")
+    print(f"{'rows':>8} | {'기존 KB':>9} {'ms':>8} | {'인코더 KB':>9} {'ms':>8} | "
+          f"{'gzip KB':>9} {'ms':>8} | {'stream KB':>9} {'ms':>8}")
+    for count in (int(x) for x in args.rows.split(",")):
+        r = bench(make_rows(count), app, args.repeat)
+        print(f"{r['rows']:>8} | {r['stdlib_kb']:>9.1f} {r['stdlib_ms']:>8.1f} | "
+              f"{r['fast_kb']:>9.1f} {r['fast_ms']:>8.1f} | "
+              f"{r['gzip_kb']:>9.1f} {r['gzip_ms']:>8.1f} | "
+              f"{r['stream_gzip_kb']:>9.1f} {r['stream_gzip_ms']:>8.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
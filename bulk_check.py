@@ -0,0 +1,205 @@
+# bulk_check.py
+# 키워드/URL 쌍 여러 개를 한 번에 확인해서 결과를 JSONL 로 내보내는 명령행 도구 (일회성 고객 점검용).
+#
+#   python bulk_check.py pairs.csv -o results.jsonl --workers 4
+#   python bulk_check.py pairs.jsonl -o results.jsonl --checkpoint audit.ckpt   # 중단 후 같은 명령으로 이어서 실행
+#     (이어서 실행하면 "확인 실패"/"시간 초과" 였던 쌍을 다시 확인하고, 결과 파일에는 id 마다 최종 결과 한 줄만 남김)
+#   python bulk_check.py pairs.csv -o results.jsonl --fake-pages .              # 저장된 검색 페이지로 오프라인 실행
+#   python bulk_check.py pairs.csv -o results.jsonl --workers 2 --tabs 4        # 브라우저 2개 x 탭 4개
+#
+# 입력: CSV(헤더 keyword,post_url[,post_title][,id]) 또는 JSONL({"keyword":..., "post_url":..., ...})
+# 같은 검색어의 쌍은 한 번의 검색으로 묶어서 확인한다.
+# 종료 코드: 0 모두 확인, 1 확인 실패/시간 초과가 남음, 130 중단됨
+
+import os
+import sys
+import csv
+import json
+import argparse
+import threading
+from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from app.models import normalize_query
+from app.keyword import scraper
+from app.keyword.scraper import run_check_many, FAILED_STATUS, TIMEOUT_STATUS
+
+
+def read_pairs(path):
+    """CSV/JSONL 파일에서 {'id', 'keyword', 'post_url', 'post_title'} 목록을 읽음"""
+    pairs = []
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        if path.lower().endswith((".jsonl", ".ndjson")):
+            rows = (json.loads(line) for line in f if line.strip())
+        else:
+            rows = csv.DictReader(f)
+        for index, row in enumerate(rows, 1):
+            keyword = (row.get("keyword") or row.get("keyword_text") or "").strip()
+            post_url = (row.get("post_url") or "").strip()
+            if not keyword or not post_url:
+                print(f"{index}번째 행 건너뜀: keyword/post_url 누락")
+                continue
+            pairs.append({
+                "id": str(row.get("id") or index),
+                "keyword": keyword,
+                "post_url": post_url,
+                "post_title": (row.get("post_title") or "").strip() or None,
+            })
+    return pairs
+
+
+def load_checkpoint(path):
+    """이미 끝난 쌍의 id 집합 (체크포인트 파일은 한 줄에 id 하나)"""
+    if not path or not os.path.exists(path):
+        return set()
+    with open(path, encoding="utf-8") as f:
+        return {line.strip() for line in f if line.strip()}
+
+
+def keep_final_results(output_path, done):
+    """이어서 실행하기 전에 결과 파일에서 체크포인트에 없는(다시 확인할) 쌍의 줄을 지움
+    -> 다시 확인한 결과가 덧붙어도 id 마다 한 줄만 남음"""
+    if not os.path.exists(output_path):
+        return
+    kept = []
+    with open(output_path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # 중단될 때 반쯤 쓰인 줄
+            if record.get("id") in done:
+                kept.append(line if line.endswith("\n") else line + "\n")
+    tmp_path = output_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.writelines(kept)
+    os.replace(tmp_path, output_path)
+
+
+class ResultSink:
+    """결과 JSONL 과 체크포인트를 함께 기록 (결과를 먼저 쓰고 체크포인트를 나중에 씀)"""
+
+    def __init__(self, output_path, checkpoint_path, done=()):
+        mode = "a" if done else "w"
+        if done:
+            keep_final_results(output_path, done)
+        self.output = open(output_path, mode, encoding="utf-8")
+        self.checkpoint = open(checkpoint_path, mode, encoding="utf-8") if checkpoint_path else None
+        self._lock = threading.Lock()
+        self.written = 0
+        self.unresolved = 0  # "확인 실패"/"시간 초과"로 끝난 쌍 수
+
+    def write(self, pair, result):
+        status, rank, section = result
+        record = {
+            "id": pair["id"],
+            "keyword": pair["keyword"],
+            "post_url": pair["post_url"],
+            "post_title": pair["post_title"],
+            "status": status,
+            "rank": rank,
+            "section": section,
+            "checked_at": datetime.now(timezone.utc).isoformat(),
+        }
+        with self._lock:
+            # 중간에 죽어도 결과가 빠지지 않도록: 결과 flush -> 체크포인트 flush 순서
+            self.output.write(json.dumps(record, ensure_ascii=False) + "\n")
+            self.output.flush()
+            # "확인 실패"/"시간 초과"는 답을 얻지 못한 것이므로 체크포인트에 남기지 않아 다시 실행하면 재시도됨
+            if status in (FAILED_STATUS, TIMEOUT_STATUS):
+                self.unresolved += 1
+            elif self.checkpoint:
+                self.checkpoint.write(pair["id"] + "\n")
+                self.checkpoint.flush()
+                os.fsync(self.checkpoint.fileno())
+            self.written += 1
+
+    def close(self):
+        self.output.close()
+        if self.checkpoint:
+            self.checkpoint.close()
+
+
+def check_group(query_text, group, sink, args, tab_pool=None):
+    """같은 검색어의 쌍들을 한 번에 확인하고 바로 기록"""
+    check = tab_pool.check if tab_pool else run_check_many
+    results = check(query_text, [(p["post_url"], p["post_title"]) for p in group],
+                    deep=args.deep, deep_depth=args.deep_depth,
+                    deadline_seconds=args.deadline)
+    for pair, result in zip(group, results):
+        sink.write(pair, result)
+    return len(group)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="키워드/URL 쌍 대량 순위 확인 (결과는 JSONL)")
+    parser.add_argument("input", help="CSV 또는 JSONL 입력 파일")
+    parser.add_argument("-o", "--output", required=True, help="결과 JSONL 파일")
+    parser.add_argument("--workers", type=int, default=2, help="동시에 돌릴 확인 작업 수 (--tabs 사용 시 브라우저 수)")
+    parser.add_argument("--tabs", type=int, default=0, help="브라우저 하나당 동시에 여는 탭 수 (0이면 확인마다 브라우저 실행)")
+    parser.add_argument("--checkpoint", help="이어서 실행하기 위한 체크포인트 파일")
+    parser.add_argument("--deep", action="store_true", help="통합검색에 없으면 블로그/카페/VIEW 탭까지 확인")
+    parser.add_argument("--deep-depth", type=int, default=None)
+    parser.add_argument("--deadline", type=float, default=None, help="확인 한 건당 시간 예산(초)")
+    parser.add_argument("--search-base-url", help="검색 서버 주소 (기록/가짜 서버 사용 시)")
+    parser.add_argument("--fake-pages", help="이 폴더의 debug_*.html 로 가짜 검색 서버를 띄워서 오프라인 실행")
+    args = parser.parse_args(argv)
+
+    fake = None
+    if args.fake_pages:
+        from app.keyword.fake_search import FakeSearchServer
+        fake = FakeSearchServer(args.fake_pages).start()
+        scraper.SEARCH_BASE_URL = fake.base_url
+    elif args.search_base_url:
+        scraper.SEARCH_BASE_URL = args.search_base_url.rstrip("/")
+
+    pairs = read_pairs(args.input)
+    done = load_checkpoint(args.checkpoint)
+    todo = [pair for pair in pairs if pair["id"] not in done]
+    print(f"전체 {len(pairs)}쌍 중 {len(done & {p['id'] for p in pairs})}쌍 완료됨, {len(todo)}쌍 확인 예정",
+          file=sys.stderr)
+
+    # 검색어 단위로 묶어서 같은 검색 결과 페이지를 한 번만 가져옴
+    groups = {}
+    for pair in todo:
+        groups.setdefault(normalize_query(pair["keyword"]), []).append(pair)
+
+    sink = ResultSink(args.output, args.checkpoint, done)
+    failed = 0
+    workers = max(1, args.workers)
+    tab_pools = []
+    if args.tabs > 0 and groups:
+        from app.keyword.tabs import TabPool
+        tab_pools = [TabPool(args.tabs) for _ in range(workers)]
+    pool = ThreadPoolExecutor(max_workers=workers * max(1, args.tabs))
+    try:
+        futures = {pool.submit(check_group, query_text, group, sink, args,
+                               tab_pools[i % len(tab_pools)] if tab_pools else None): query_text
+                   for i, (query_text, group) in enumerate(groups.items())}
+        for future in as_completed(futures):
+            try:
+                future.result()
+            except Exception as e:
+                failed += 1
+                print(f"'{futures[future]}' 확인 중 오류: {e}", file=sys.stderr)
+            print(f"진행: {sink.written}/{len(todo)}", file=sys.stderr)
+    except KeyboardInterrupt:
+        print("중단됨 - 진행 중인 확인만 마무리합니다. 같은 명령을 --checkpoint 와 함께 다시 실행하면 이어서 진행합니다.",
+              file=sys.stderr)
+        return 130
+    finally:
+        # 대기 중인 작업은 버리고, 이미 시작한 확인은 결과까지 기록한 뒤 종료
+        pool.shutdown(wait=True, cancel_futures=True)
+        for tab_pool in tab_pools:
+            tab_pool.close()
+        sink.close()
+        if fake:
+            fake.stop()
+
+    if sink.unresolved:
+        print(f"확인 실패/시간 초과 {sink.unresolved}쌍 - --checkpoint 와 함께 다시 실행하면 재시도합니다.", file=sys.stderr)
+    return 1 if failed or sink.unresolved else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -12,4 +12,8 @@ class Config:
         database_url = database_url.replace('postgres://', 'postgresql://', 1)
     
     SQLALCHEMY_DATABASE_URI = database_url
-    SQLALCHEMY_TRACK_MODIFICATIONS = False
\ No newline at end of file
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+
+    # 순위 확인 결과 일괄 저장 (이 개수가 쌓이거나 이 시간(초)이 지나면 저장)
+    RESULT_FLUSH_SIZE = int(os.environ.get('RESULT_FLUSH_SIZE') or 50)
+    RESULT_FLUSH_INTERVAL = float(os.environ.get('RESULT_FLUSH_INTERVAL') or 2.0)
\ No newline at end of file
@@ -0,0 +1,227 @@
+# loadtest.py
+# 로컬 가짜 검색 서버를 띄워 놓고 Flask 앱 + run_check 전체 경로에 부하를 주는 스크립트.
+#
+#   python loadtest.py --levels 1,2,4 --checks 8 --latency 0.2,0.8 --error-rate 0.05
+#
+# 동시성 단계마다 초당 처리 건수, p50/p95/p99 지연, 브라우저별 CPU/RSS 를 출력한다.
+
+import os
+import re
+import sys
+import json
+import math
+import time
+import argparse
+import tempfile
+import threading
+import statistics
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+
+import jwt
+import psutil
+
+from app.keyword.fake_search import FakeSearchServer
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def first_blog_url(html):
+    """저장된 페이지에서 첫 번째 블로그 글 주소를 찾아 추적 대상 URL로 사용"""
+    match = re.search(r'href="(https://blog\.naver\.com/[^"]+)"', html)
+    return match.group(1) if match else "https://blog.naver.com/loadtest/1"
+
+
+class BrowserSampler:
+    """이 프로세스가 띄운 chrome 프로세스 트리를 주기적으로 측정"""
+
+    def __init__(self, interval=0.5):
+        self.interval = interval
+        self.browsers = {}  # 브라우저 pid -> {'rss': [...], 'cpu': [...]}
+        self._stop = threading.Event()
+        self._procs = {}
+        self._thread = None
+
+    def _browser_roots(self):
+        """chromedriver 바로 아래의 chrome 프로세스를 브라우저 하나로 본다"""
+        roots = []
+        for child in psutil.Process().children(recursive=True):
+            try:
+                if "chrome" in child.name().lower() and "chromedriver" not in child.name().lower():
+                    parent = child.parent()
+                    if parent and "chromedriver" in parent.name().lower():
+                        roots.append(child)
+            except psutil.Error:
+                continue
+        return roots
+
+    def _sample(self):
+        for root in self._browser_roots():
+            try:
+                tree = [root] + root.children(recursive=True)
+                rss = 0
+                cpu = 0.0
+                for proc in tree:
+                    # cpu_percent 는 같은 Process 객체로 두 번째 호출부터 값이 나옴
+                    proc = self._procs.setdefault(proc.pid, proc)
+                    rss += proc.memory_info().rss
+                    cpu += proc.cpu_percent(None)
+            except psutil.Error:
+                continue
+            stats = self.browsers.setdefault(root.pid, {'rss': [], 'cpu': []})
+            stats['rss'].append(rss)
+            stats['cpu'].append(cpu)
+
+    def _loop(self):
+        while not self._stop.is_set():
+            self._sample()
+            self._stop.wait(self.interval)
+
+    def start(self):
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+
+    def summary(self):
+        rows = []
+        for pid, stats in self.browsers.items():
+            rows.append({
+                'pid': pid,
+                'peak_rss_mb': round(max(stats['rss']) / 1024 / 1024, 1),
+                'avg_rss_mb': round(statistics.mean(stats['rss']) / 1024 / 1024, 1),
+                'avg_cpu_percent': round(statistics.mean(stats['cpu'][1:] or stats['cpu']), 1),
+                'samples': len(stats['rss']),
+            })
+        return rows
+
+
+def run_level(app, token, keyword_ids, concurrency, checks):
+    """동시성 concurrency 로 checks 건의 순위 확인 요청을 보냄"""
+    headers = {'Authorization': f'Bearer {token}'}
+    latencies = []
+    statuses = {}
+    lock = threading.Lock()
+
+    def one_check(i):
+        keyword_id = keyword_ids[i % len(keyword_ids)]
+        client = app.test_client()
+        started = time.perf_counter()
+        res = client.post(f'/keyword/keywords/{keyword_id}/check', headers=headers)
+        elapsed = time.perf_counter() - started
+        status = (res.get_json(silent=True) or {}).get('status', f'HTTP {res.status_code}')
+        with lock:
+            latencies.append(elapsed)
+            statuses[status] = statuses.get(status, 0) + 1
+
+    sampler = BrowserSampler()
+    sampler.start()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(one_check, range(checks)))
+    wall = time.perf_counter() - started
+    sampler.stop()
+
+    return {
+        'concurrency': concurrency,
+        'checks': checks,
+        'wall_seconds': round(wall, 2),
+        'checks_per_second': round(checks / wall, 3) if wall else 0.0,
+        'p50': round(percentile(latencies, 50), 2),
+        'p95': round(percentile(latencies, 95), 2),
+        'p99': round(percentile(latencies, 99), 2),
+        'statuses': statuses,
+        'browsers': sampler.summary(),
+    }
+
+
+def print_report(result):
+    print(f"\n=== 동시성 {result['concurrency']} : {result['checks']}건 / {result['wall_seconds']}초 ===")
+    print(f"처리량 {result['checks_per_second']} checks/s | "
+          f"p50 {result['p50']}s  p95 {result['p95']}s  p99 {result['p99']}s")
+    print(f"결과 분포: {result['statuses']}")
+    counters = result['metrics']['counters']
+    print(f"시간 초과 {counters.get('checks_timeout', 0)}건, "
+          f"지난 순위 재사용 {counters.get('checks_unchanged', 0)}건")
+    for b in result['browsers']:
+        print(f"  브라우저 pid={b['pid']}: RSS 최대 {b['peak_rss_mb']}MB / 평균 {b['avg_rss_mb']}MB, "
+              f"CPU 평균 {b['avg_cpu_percent']}%")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="가짜 검색 서버를 상대로 한 순위 확인 부하 테스트")
+    parser.add_argument("--pages-dir", default=os.path.dirname(os.path.abspath(__file__)))
+    parser.add_argument("--levels", default="1,2,4", help="동시성 단계 (쉼표 구분)")
+    parser.add_argument("--checks", type=int, default=8, help="단계마다 보낼 확인 요청 수")
+    parser.add_argument("--latency", default="0.2,0.8", help="가짜 서버 최소,최대 지연(초)")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--tabs", type=int, default=0, help="브라우저 하나를 이 수만큼의 탭으로 공유 (BROWSER_TABS)")
+    parser.add_argument("--reuse", action="store_true",
+                        help="페이지 지문이 같을 때 지난 순위 재사용을 켬 (기본은 끄고 매번 전체 추출을 측정)")
+    parser.add_argument("--json", dest="json_path", help="결과를 JSON 파일로도 저장")
+    args = parser.parse_args(argv)
+
+    low, high = (float(x) for x in args.latency.split(","))
+    fake = FakeSearchServer(args.pages_dir, latency=(low, high), error_rate=args.error_rate).start()
+
+    # scraper 가 가짜 서버를 보도록 앱을 불러오기 전에 주소를 바꿔 둔다
+    os.environ['SEARCH_BASE_URL'] = fake.base_url
+    if args.tabs:
+        os.environ['BROWSER_TABS'] = str(args.tabs)
+    # 가짜 서버는 같은 페이지를 돌려주므로 재사용을 켜 두면 두 번째 확인부터 추출 없이 끝남
+    os.environ['PAGE_REUSE'] = '1' if args.reuse else '0'
+    from app import create_app
+    from app.models import db, User, Keyword
+    from app.keyword import metrics
+    from config import Config
+
+    db_path = os.path.join(tempfile.mkdtemp(prefix="loadtest-"), "loadtest.db")
+
+    class LoadTestConfig(Config):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{db_path}"
+
+    app = create_app(LoadTestConfig)
+    with app.app_context():
+        db.create_all()
+        user = User(email="loadtest@example.com", password="-")
+        db.session.add(user)
+        db.session.commit()
+        keyword_ids = []
+        for name, html in fake.pages.items():
+            keyword = Keyword(user_id=user.id, keyword_text=name,
+                              post_url=first_blog_url(html.decode("utf-8", "ignore")))
+            db.session.add(keyword)
+            db.session.commit()
+            keyword_ids.append(keyword.id)
+        token = jwt.encode({'user_id': user.id, 'exp': datetime.utcnow() + timedelta(hours=1)},
+                           app.config['SECRET_KEY'], algorithm="HS256")
+
+    results = []
+    try:
+        for level in (int(x) for x in args.levels.split(",")):
+            metrics.reset()
+            result = run_level(app, token, keyword_ids, level, args.checks)
+            result['metrics'] = metrics.snapshot()
+            print_report(result)
+            results.append(result)
+    finally:
+        fake.stop()
+
+    print(f"\n가짜 서버 요청 {fake.request_count}건 (오류 {fake.error_count}건)")
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
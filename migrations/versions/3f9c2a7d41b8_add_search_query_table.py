@@ -0,0 +1,69 @@
+"""Add search_query table shared by keywords
+
+Revision ID: 3f9c2a7d41b8
+Revises: 81cdbdc3aaba
+Create Date: 2026-10-19 10:12:40.512733
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f9c2a7d41b8'
+down_revision = '81cdbdc3aaba'
+branch_labels = None
+depends_on = None
+
+
+def normalize_query(text):
+    # app.models.normalize_query 와 동일 (마이그레이션은 앱 코드에 의존하지 않도록 복사)
+    return " ".join((text or "").split()).lower()
+
+
+def upgrade():
+    op.create_table('search_query',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('query_text', sa.String(length=100), nullable=False),
+    sa.Column('last_checked_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('query_text')
+    )
+    with op.batch_alter_table('keyword', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('search_query_id', sa.Integer(), nullable=True))
+        batch_op.create_index(batch_op.f('ix_keyword_search_query_id'), ['search_query_id'], unique=False)
+        batch_op.create_foreign_key('fk_keyword_search_query_id', 'search_query', ['search_query_id'], ['id'])
+
+    # 기존 키워드를 정규화된 검색어로 묶어서 채워 넣기
+    conn = op.get_bind()
+    keyword = sa.table('keyword',
+        sa.column('id', sa.Integer),
+        sa.column('keyword_text', sa.String),
+        sa.column('search_query_id', sa.Integer),
+    )
+    search_query = sa.table('search_query',
+        sa.column('id', sa.Integer),
+        sa.column('query_text', sa.String),
+    )
+
+    rows = conn.execute(sa.select(keyword.c.id, keyword.c.keyword_text)).fetchall()
+    query_ids = {}
+    for keyword_id, keyword_text in rows:
+        query_text = normalize_query(keyword_text)
+        if query_text not in query_ids:
+            conn.execute(search_query.insert().values(query_text=query_text))
+            query_ids[query_text] = conn.execute(
+                sa.select(search_query.c.id).where(search_query.c.query_text == query_text)
+            ).scalar()
+        conn.execute(
+            keyword.update().where(keyword.c.id == keyword_id).values(search_query_id=query_ids[query_text])
+        )
+
+
+def downgrade():
+    with op.batch_alter_table('keyword', schema=None) as batch_op:
+        batch_op.drop_constraint('fk_keyword_search_query_id', type_='foreignkey')
+        batch_op.drop_index(batch_op.f('ix_keyword_search_query_id'))
+        batch_op.drop_column('search_query_id')
+
+    op.drop_table('search_query')